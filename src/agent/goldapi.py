@@ -1,11 +1,13 @@
-import yfinance as yf
 from datetime import date, timedelta
 from typing import Optional
+from src.data.ohlcv_cache import cache_from_env
 
-GOLD = yf.Ticker("GC=F")
+GOLD_TICKER = "GC=F"
+# Local OHLCV copy; only date gaps it hasn't seen are fetched (MARKET_DATA_OFFLINE=1 never fetches)
+MARKET_DATA = cache_from_env()
 
 def _get_hist(start: str, end: str):
-    df = GOLD.history(start=start, end=end, interval="1d") 
+    df = MARKET_DATA.history(GOLD_TICKER, start, end, interval="1d")
     if df.empty:
         raise ValueError(f"No data returned for {start} to {end}")
     return df
@@ -38,6 +40,9 @@ def get_range_relative(
     end = date.today()
     return get_open_close_in_range(start.isoformat(), end.isoformat())
 
+import os
+
+import numpy as np
 import pandas as pd
 
 def write_price_range_to_csv(start_date: str, end_date: str, filename: str = "gold_prices.csv") -> str:
@@ -57,38 +62,72 @@ def write_price_range_to_csv(start_date: str, end_date: str, filename: str = "go
 def safe_float_format(value, ndigits=2, default='N/A'):
     return f"{float(value):.{ndigits}f}"
     
+STRATEGY_COLUMNS = [
+    "sma_cross", "ema_cross", "rsi_signal", "macd_signal", "bollinger_signal", "stoch_signal",
+    "williams_signal", "cci_signal", "roc_signal", "adx_trend", "vortex_signal", "obv_signal",
+    "final_decision",
+]
+
+class _IndicatorLines:
+    """
+    One feature file loaded into date-sorted arrays, with each day's signal line
+    rendered on first use and memoized.
+    """
+
+    def __init__(self, path: str, mtime: float):
+        from src.data.feature_store import load_features  # pyarrow only when a feature file is read
+
+        self.mtime = mtime
+        df = load_features(path, columns=["open", "close"] + STRATEGY_COLUMNS)
+        df = df.sort_values("date", kind="stable", ignore_index=True)
+        self.dates = df["date"].to_numpy(dtype="datetime64[ns]")
+        self.values = {col: df[col].tolist() for col in ["open", "close"] + STRATEGY_COLUMNS}
+        self.lines = [None] * len(df)
+
+    def _render(self, i: int) -> str:
+        v = self.values
+        return (
+            f"  • {pd.Timestamp(self.dates[i]).date()}: "
+            f"open = {v['open'][i]:.2f}, close = {v['close'][i]:.2f}, "
+            + ", ".join(f"{col} = {v[col][i]}" for col in STRATEGY_COLUMNS)
+        )
+
+    def range(self, start_date: str, end_date: str) -> list:
+        lo = np.searchsorted(self.dates, np.datetime64(pd.to_datetime(start_date), "ns"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(pd.to_datetime(end_date), "ns"), side="right")
+        lines = self.lines
+        for i in range(lo, hi):
+            if lines[i] is None:
+                lines[i] = self._render(i)
+        return lines[lo:hi]
+
+
+# path -> _IndicatorLines, reloaded when the file's mtime changes
+_INDICATOR_CACHE = {}
+
+
+def _indicator_lines(path: str) -> _IndicatorLines:
+    mtime = os.path.getmtime(path)
+    cached = _INDICATOR_CACHE.get(path)
+    if cached is None or cached.mtime != mtime:
+        cached = _INDICATOR_CACHE[path] = _IndicatorLines(path, mtime)
+    return cached
+
+
 def get_technical_indicators_in_range_from_csv(start_date: str, end_date: str, csv_path: str) -> str:
-    """Reads indicator-enhanced CSV and returns a formatted string of daily strategy signals."""
-    df = pd.read_csv(csv_path, parse_dates=["date"])
-    mask = (df["date"] >= pd.to_datetime(start_date)) & (df["date"] <= pd.to_datetime(end_date))
-    df_filtered = df.loc[mask]
+    """
+    Returns a formatted string of daily strategy signals from the indicator-enhanced
+    feature file (CSV or Parquet store).
 
-    if df_filtered.empty:
-        return f"No technical indicator data found from {start_date} to {end_date}."
+    The file is loaded once per process (and again only after it changes on disk);
+    each day's line is formatted once and reused by every later lookback window.
+    """
+    lines = _indicator_lines(csv_path).range(start_date, end_date)
 
-    lines = [f"Technical strategy signals from {start_date} to {end_date}:\n"]
-    for _, row in df_filtered.iterrows():
-        date = row["date"].date()
-        line = (
-            f"  • {date}: "
-            f"open = {row['open']:.2f}, close = {row['close']:.2f}, "
-            f"sma_cross = {row['sma_cross']}, "
-            f"ema_cross = {row['ema_cross']}, "
-            f"rsi_signal = {row['rsi_signal']}, "
-            f"macd_signal = {row['macd_signal']}, "
-            f"bollinger_signal = {row['bollinger_signal']}, "
-            f"stoch_signal = {row['stoch_signal']}, "
-            f"williams_signal = {row['williams_signal']}, "
-            f"cci_signal = {row['cci_signal']}, "
-            f"roc_signal = {row['roc_signal']}, "
-            f"adx_trend = {row['adx_trend']}, "
-            f"vortex_signal = {row['vortex_signal']}, "
-            f"obv_signal = {row['obv_signal']}, "
-            f"final_decision = {row['final_decision']}"
-        )
-        lines.append(line)
+    if not lines:
+        return f"No technical indicator data found from {start_date} to {end_date}."
 
-    return "\n".join(lines)
+    return "\n".join([f"Technical strategy signals from {start_date} to {end_date}:\n"] + lines)
 
 
 def write_ohlcv_range_to_csv(start_date: str, end_date: str, filename: str = "gold_prices_ohlcv.csv") -> str:
@@ -111,4 +150,5 @@ def write_ohlcv_range_to_csv(start_date: str, end_date: str, filename: str = "go
     return f"Saved gold OHLCV data from {start_date} to {end_date} to {filename}"
 
 
-write_ohlcv_range_to_csv("2020-01-01", "2025-08-01","gold_ohlcv_2020_2025.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    write_ohlcv_range_to_csv("2020-01-01", "2025-08-01","gold_ohlcv_2020_2025.csv")
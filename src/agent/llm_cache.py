@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import httpx
+
+CACHE_MODES = ("readwrite", "replay")
+
+# Request fields that make up the cache key; anything else in the body is hashed as extra params
+_KEY_FIELDS = ("model", "temperature", "messages", "tools")
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay mode when a request has no cached response."""
+
+
+def cache_key(model, temperature, messages, tools=None, **params) -> str:
+    """Content hash of one chat-completion request."""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages, "tools": tools or [], "params": params},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent, size-bounded LRU cache of chat-completion responses (SQLite).
+
+    In "readwrite" mode misses are fetched and stored; in "replay" mode a miss
+    raises LLMCacheMiss, so a backtest either reproduces a previous run exactly
+    or fails. Once the stored responses exceed ``max_bytes`` the least recently
+    used ones are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 2**20, mode: str = "readwrite"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"LLM cache mode '{mode}' is not valid. Valid options are: {', '.join(CACHE_MODES)}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """LLMCache for the ``llm_cache`` config section, or None when it's absent or disabled."""
+        section = config.get("llm_cache") or {}
+        if not section.get("enabled", True) or not section.get("path"):
+            return None
+        return cls(section["path"], max_bytes=int(section.get("max_mb", 512) * 2**20), mode=section.get("mode", "readwrite"))
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                if self.mode == "replay":
+                    raise LLMCacheMiss(f"no cached LLM response for request {key[:12]} (replay-only mode)")
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, response: bytes):
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, len(response), time.time()),
+            )
+            self._size += len(response) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                if self._size <= self.max_bytes:
+                    break
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _request_key(request: httpx.Request):
+    """Cache key for a non-streaming chat-completion POST, else None."""
+    if request.method != "POST" or not request.url.path.endswith("/chat/completions"):
+        return None
+    try:
+        body = json.loads(request.content)
+    except ValueError:
+        return None
+    if body.get("stream"):
+        return None
+    params = {k: v for k, v in body.items() if k not in _KEY_FIELDS}
+    return cache_key(*(body.get(k) for k in _KEY_FIELDS), **params)
+
+
+class CachingTransport(httpx.BaseTransport):
+    """
+    httpx transport that answers chat-completion requests from an LLMCache.
+
+    It sits beneath both the openai ``OpenAI`` client and langchain's
+    ``ChatOpenAI`` (which talks through the same SDK), so every model call in
+    the agent and its tools is cached without touching the call sites.
+    """
+
+    def __init__(self, cache: LLMCache, transport: httpx.BaseTransport = None):
+        self.cache = cache
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = _request_key(request)
+        if key is None:
+            return self.transport.handle_request(request)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return httpx.Response(200, content=cached, headers={"content-type": "application/json"}, request=request)
+
+        response = self.transport.handle_request(request)
+        if response.status_code != 200:
+            return response
+        content = response.read()
+        self.cache.put(key, content)
+        return httpx.Response(200, content=content, headers={"content-type": "application/json"}, request=request)
+
+    def close(self):
+        self.transport.close()
+
+
+def cached_client_kwargs(cache: LLMCache = None) -> dict:
+    """
+    Keyword arguments that route an ``OpenAI``/``ChatOpenAI`` client through ``cache``.
+
+    In replay mode SDK retries are disabled: a miss is final, and surfaces as
+    openai.APIConnectionError caused by LLMCacheMiss.
+    """
+    if cache is None:
+        return {}
+    kwargs = {"http_client": httpx.Client(transport=CachingTransport(cache))}
+    if cache.mode == "replay":
+        kwargs["max_retries"] = 0
+    return kwargs
@@ -1,57 +1,91 @@
-import yfinance as yf
 import pandas as pd
 from datetime import timedelta
 import warnings
 warnings.filterwarnings("ignore")
 
+ASSETS = [
+    {'name': 'Bitcoin', 'ticker': 'BTC-USD', 'price_unit': 'USD', 'volume_unit': 'BTC'},
+    {'name': 'Etherium', 'ticker': 'ETH-USD', 'price_unit': 'USD', 'volume_unit': 'ETH'},
+    {'name': 'USDT', 'ticker': 'USDT-USD', 'price_unit': 'USD', 'volume_unit': 'USDT'},
+    {'name': 'Gold',     'ticker': 'GLD',     'price_unit': 'USD per share',   'volume_unit': 'shares'},
+    {'name': 'Oil',      'ticker': 'CL=F',    'price_unit': 'USD per barrel',  'volume_unit': 'contracts'},
+    {'name': 'S&P 500',  'ticker': '^GSPC',   'price_unit': 'points',          'volume_unit': 'shares'}
+]
+
+# tickers -> (start, end, close panel, volume panel) of the last bulk download, reused for sub-spans
+_PANELS = {}
+
+
+def load_market_panel(tickers, start, end):
+    """
+    Daily close and volume panels (calendar date x ticker) for start <= date <= end.
+
+    All tickers are fetched in a single bulk yf.download; later requests inside an
+    already downloaded span are served from memory.
+    """
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    key = tuple(tickers)
+    cached = _PANELS.get(key)
+    if cached is None or start < cached[0] or end > cached[1]:
+        import yfinance as yf
+        data = yf.download(list(tickers), start=start, end=end + timedelta(days=1), group_by='column', progress=False)
+        close, volume = data["Close"], data["Volume"]
+        if isinstance(close, pd.Series):  # a single ticker comes back without the ticker level
+            close, volume = close.to_frame(tickers[0]), volume.to_frame(tickers[0])
+        # one row per calendar day, so "the previous day" is always the previous row
+        days = pd.date_range(start, end, freq="D")
+        index = pd.DatetimeIndex(close.index).tz_localize(None).normalize()
+        close = close.set_axis(index).groupby(level=0).last().reindex(days)[list(tickers)]
+        volume = volume.set_axis(index).groupby(level=0).last().reindex(days)[list(tickers)]
+        cached = _PANELS[key] = (start, end, close, volume)
+    return cached[2], cached[3]
+
+
+def generate_paragraphs_for_dates(dates, assets=ASSETS):
+    if not len(dates):
+        return []
+    days = [pd.to_datetime(d).normalize() for d in dates]
+    tickers = [asset['ticker'] for asset in assets]
+    close, volume = load_market_panel(tickers, min(days) - timedelta(days=1), max(days))
+
+    # % change of each day's close against the previous calendar day's, for every ticker at once
+    change = (close / close.shift(1) - 1) * 100
+    available = close.notna() & close.shift(1).notna()
+
+    paragraphs = []
+    for date_str, day in zip(dates, days):
+        paragraph = f"On {date_str}, "
+        for asset in assets:
+            name, ticker = asset['name'], asset['ticker']
+            if not available.at[day, ticker]:
+                paragraph += f"{name} data not available for {date_str}. "
+                continue
+
+            close_today = float(close.at[day, ticker])
+            volume_today = volume.at[day, ticker]
+            # indices, FX and gappy tickers often have no volume in the bulk panel
+            volume_today = int(volume_today) if pd.notna(volume_today) else None
+            pct = float(change.at[day, ticker])
+
+            if pct > 0:
+                direction = "rose"
+            elif pct < 0:
+                direction = "fell"
+            else:
+                direction = "remained unchanged"
+
+            paragraph += f"{name} {direction} by {abs(pct):.2f}% to {close_today:.2f} {asset['price_unit']}"
+            if volume_today is not None:
+                paragraph += f", with a trading volume of {volume_today:,} {asset['volume_unit']}"
+            paragraph += ". "
+        paragraphs.append(paragraph)
+    return paragraphs
+
+
 def generate_economics_paragraph(date_str):
-    date = pd.to_datetime(date_str)
-    prev_date = date - timedelta(days=1)
-
-    assets = [
-        {'name': 'Bitcoin', 'ticker': 'BTC-USD', 'price_unit': 'USD', 'volume_unit': 'BTC'},
-        {'name': 'Etherium', 'ticker': 'ETH-USD', 'price_unit': 'USD', 'volume_unit': 'ETH'},
-        {'name': 'USDT', 'ticker': 'USDT-USD', 'price_unit': 'USD', 'volume_unit': 'USDT'},
-        {'name': 'Gold',     'ticker': 'GLD',     'price_unit': 'USD per share',   'volume_unit': 'shares'},
-        {'name': 'Oil',      'ticker': 'CL=F',    'price_unit': 'USD per barrel',  'volume_unit': 'contracts'},
-        {'name': 'S&P 500',  'ticker': '^GSPC',   'price_unit': 'points',          'volume_unit': 'shares'}
-    ]
-
-    paragraph = f"On {date_str}, "
-
-    for asset in assets:
-        name = asset['name']
-        ticker = asset['ticker']
-
-        data = yf.download(ticker, start=prev_date, end=date + timedelta(days=1))
-        print(data)
-        if data.shape[0] < 2:
-            paragraph += f"{name} data not available for {date_str}. "
-            continue
-
-        close_yesterday = float(data["Close"].iloc[0])
-        close_today     = float(data["Close"].iloc[-1])
-        volume_today    = int(data["Volume"].iloc[-1])
-        change = (close_today - close_yesterday) / close_yesterday * 100
-
-        if change > 0:
-            direction = "rose"
-        elif change < 0:
-            direction = "fell"
-        else:
-            direction = "remained unchanged"
-
-        sentence = (
-            f"{name} {direction} by {abs(change):.2f}% to {close_today:.2f} "
-            f"{asset['price_unit']}, with a trading volume of {volume_today:,} {asset['volume_unit']}. "
-        )
-        paragraph += sentence
-
-    return paragraph
-
-
-def generate_paragraphs_for_dates(dates):
-    return [generate_economics_paragraph(date) for date in dates]
-
-# Example usage
-print(generate_economics_paragraph('2025-08-01'))
+    return generate_paragraphs_for_dates([date_str])[0]
+
+
+if __name__ == "__main__":
+    # Example usage
+    print(generate_economics_paragraph('2025-08-01'))
@@ -0,0 +1,183 @@
+"""
+Per-date digests of the most important news, computed once and looked up by the
+``get_date_important_news_topics`` tool.
+
+    python -m src.agent.news_digest --workers 8
+"""
+import argparse
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+import yaml
+
+from src.data.news_store import open_news_store
+
+# Articles sent to the model per date
+MAX_ARTICLES = 100
+DIGEST_MODEL = "gemini-2.0-flash-001"
+
+
+def digest_prompt(date: str, news_texts) -> str:
+    all_news_text = "\n\n".join(f"Text: {text}\n" for text in news_texts)
+    return f"""
+        You are given a list of news articles for {date}. 
+        Your task:
+        1. Identify the 7 most important and most related news articles that will globaly effect the stock market prices.  
+        2. Return them as a list.  
+        3. Remove unnecessary/irrelevant parts of each article, keeping the essential information.  
+        4. Preserve the full meaning of each article (not just headlines).  
+
+        News articles:
+        {all_news_text}
+
+        Now, provide the cleaned list of the top 7 most important news articles:
+        """
+
+
+def summarize_date(client, date: str, news_texts) -> str:
+    response = client.chat.completions.create(
+        model=DIGEST_MODEL,
+        messages=[
+            {
+                "role": "user",
+                "content": digest_prompt(date, news_texts),
+            },
+        ],
+    )
+    return response.choices[0].message.content
+
+
+class _MtimeCache:
+    """path -> value built by ``load(path)``, rebuilt when the file's mtime changes."""
+
+    def __init__(self, load):
+        self.load = load
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, path: str):
+        mtime = os.path.getmtime(path)
+        with self.lock:
+            cached = self.entries.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = self.entries[path] = (mtime, self.load(path))
+            return cached[1]
+
+
+def _load_digests(digest_path: str) -> dict:
+    df = pd.read_parquet(digest_path, columns=["date", "digest"])
+    return dict(zip(df["date"], df["digest"]))
+
+
+_DIGESTS = _MtimeCache(_load_digests)
+# (news_csv, date) -> Future of the digest summarized on demand for dates missing from the table;
+# concurrent backtest windows asking for the same date wait on the first one's summarization
+_ON_DEMAND = {}
+_ON_DEMAND_LOCK = threading.Lock()
+
+
+def news_for_date(news_path: str, date: str):
+    """Up to MAX_ARTICLES article texts for ``date`` from the shared date-indexed news store."""
+    return open_news_store(news_path).texts(date, MAX_ARTICLES)
+
+
+def get_digest(date: str, news_csv: str, client, digest_path: str = None):
+    """
+    Digest for ``date``: from the precomputed table when present, otherwise
+    summarized once and memoized for the rest of the process. None when there
+    is no news for the date.
+    """
+    if digest_path and os.path.exists(digest_path):
+        digest = _DIGESTS.get(digest_path).get(date)
+        if digest is not None:
+            return digest
+    key = (news_csv, date)
+    with _ON_DEMAND_LOCK:
+        future = _ON_DEMAND.get(key)
+        owner = future is None
+        if owner:
+            future = _ON_DEMAND[key] = Future()
+    if owner:
+        try:
+            news_texts = news_for_date(news_csv, date)
+            future.set_result(summarize_date(client, date, news_texts) if news_texts else None)
+        except BaseException as e:
+            # forget the failure so a later call retries; current waiters get the error
+            with _ON_DEMAND_LOCK:
+                del _ON_DEMAND[key]
+            future.set_exception(e)
+    return future.result()
+
+
+def build_digests(news_csv: str, digest_path: str, client, start_date=None, end_date=None, workers=4):
+    """
+    Summarizes every date in ``news_csv`` (optionally within [start_date, end_date])
+    that isn't already in the digest table, ``workers`` dates at a time.
+
+    The table is rewritten after each batch of finished dates, so an interrupted
+    run keeps what it has done.
+    """
+    store = open_news_store(news_csv)
+    dates = [d for d in store.dates() if (start_date is None or d >= start_date) and (end_date is None or d <= end_date)]
+
+    existing = pd.read_parquet(digest_path) if os.path.exists(digest_path) else pd.DataFrame(columns=["date", "n_articles", "digest"])
+    done = set(existing["date"])
+    todo = [d for d in dates if d not in done]
+    print(f"Summarizing {len(todo)} dates ({len(dates) - len(todo)} already digested)")
+
+    rows = []
+
+    def save():
+        table = pd.concat([existing, pd.DataFrame(rows, columns=["date", "n_articles", "digest"])], ignore_index=True)
+        table.sort_values("date", ignore_index=True).to_parquet(digest_path, index=False)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(summarize_date, client, d, store.texts(d, MAX_ARTICLES)): d for d in todo}
+        try:
+            for n, future in enumerate(as_completed(futures), 1):
+                d = futures[future]
+                rows.append({"date": d, "n_articles": min(store.index[d][1], MAX_ARTICLES), "digest": future.result()})
+                if n % 50 == 0:
+                    save()
+        except BaseException:
+            # don't keep summarizing dates whose results would be thrown away
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            save()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
+    from src.agent.llm_cache import LLMCache, cached_client_kwargs
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", default="configs/run_pipline.yaml")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--all-dates", action="store_true", help="digest every date in the news file, not just the backtest range")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    load_dotenv()
+    client = OpenAI(
+        api_key=os.getenv("AVVALAI_API_KEY"),
+        base_url='https://api.gapgpt.app/v1',
+        **cached_client_kwargs(LLMCache.from_config(config)),
+    )
+
+    start_date = end_date = None
+    if not args.all_dates:
+        start_date = datetime.strptime(config["dates"]["start_date"], "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
+        end_date = datetime.strptime(config["dates"]["end_date"], "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
+
+    n = build_digests(config["paths"]["news"], config["paths"]["news_digests"], client, start_date, end_date, args.workers)
+    print(f"Digested {n} dates into {config['paths']['news_digests']}")
@@ -1,18 +1,10 @@
 import os
 import yaml
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
 from src.agent.goldapi import get_technical_indicators_in_range_from_csv
 from pydantic import BaseModel
 from typing import List, Literal
-import os
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
-from src.agent.tools import *
-from src.agent.goldapi import get_technical_indicators_in_range_from_csv
-from pydantic import BaseModel
-from typing import List, Literal
-import yaml
+
+# LangChain and OpenAI are imported where they're used, keeping module import cheap.
 
 class TradeStrategy(BaseModel):
     date: str
@@ -23,8 +15,11 @@ class StrategyOutput(BaseModel):
     strategy: List[TradeStrategy]
 
 class GoldTradingNumericalLLM:
-    def __init__(self):
+    def __init__(self, llm_cache=None):
         from dotenv import load_dotenv
+        from langchain_openai import ChatOpenAI
+        from openai import OpenAI
+        from src.agent.llm_cache import cached_client_kwargs
         load_dotenv()
         os.environ["OPENAI_API_KEY"] = os.getenv("AVVALAI_API_KEY")
         self.llm = ChatOpenAI(
@@ -32,10 +27,12 @@ class GoldTradingNumericalLLM:
             base_url='https://api.gapgpt.app/v1',
             temperature=1,
             max_tokens=5000,
+            **cached_client_kwargs(llm_cache),
         )
         self.client = OpenAI(
             api_key= os.environ["OPENAI_API_KEY"], 
             base_url='https://api.gapgpt.app/v1',
+            **cached_client_kwargs(llm_cache),
         )
     def run(self, start_date: str, end_date: str, numerical_csv: str) -> StrategyOutput:
         
@@ -64,16 +61,20 @@ class GoldTradingNumericalLLM:
                 
                 """
 
+        from langchain_core.messages import HumanMessage
+
         input_msg = HumanMessage(content=user_prompt)
         response = self.llm.invoke([input_msg])
         return response.content
 
 if __name__ == "__main__":
-    agent = GoldTradingNumericalLLM()
+    from src.agent.llm_cache import LLMCache
 
     with open("configs/run_pipline.yaml", 'r') as f:
         config = yaml.safe_load(f)
 
+    agent = GoldTradingNumericalLLM(llm_cache=LLMCache.from_config(config))
+
     strategy_output = agent.run(
         start_date=config["dates"]["start_date"],
         end_date=config["dates"]["end_date"],
@@ -0,0 +1,220 @@
+from functools import lru_cache
+from string import Formatter
+from typing import Callable, Dict, Optional
+
+from src.agent.goldapi import get_technical_indicators_in_range_from_csv
+
+# User prompt templates, keyed by inference type. ``{indicators}`` is replaced by the
+# technical-indicator block for the lookback window; literal braces are doubled.
+
+SIMPLE_USER_PROMPT = """
+                You are a trading assistant. Based on the daily technical indicators and gold price open/close values, decide whether the strategy for future day is:
+                - 1 → Buy
+                - 0 → Sell
+                - 2 → Neutral (Wait)
+
+                Use these indicators to help you:
+                - **SMA & EMA crossover**: Buy if short > long, Sell if short < long.
+                - **MACD**: Buy if MACD > Signal, Sell if MACD < Signal.
+                - **RSI**: Buy if RSI < 30, Sell if RSI > 70.
+                - **Bollinger Bands**: Buy if close < lower band, Sell if close > upper band.
+                - **Stochastic Oscillator**: Buy if %K < 20 and rising above %D, Sell if %K > 80 and falling below %D.
+
+                Give your answer in this format:
+                {{
+                "explanation": "A detailed explanation of how indicators influenced your strategy.",
+                "action":Based on the data from all the days provided, determine the action (buy, sell, or wait) for the single day immediately following the last given date
+                }}
+
+                Here is the input data:
+
+                {indicators}
+                
+                ALWAYS USE ALL THE TOOLS ALSO SEARCH THE WEB FOR GETTING NEWS CONTENT
+                USE ONLY THE LAST TWO DAYS NEWS.
+                """
+
+COT_USER_PROMPT = """
+                You are a trading assistant. Based on the daily technical indicators and gold price open/close values, decide whether the strategy for future day is:
+                - 1 → Buy
+                - 0 → Sell
+                - 2 → Neutral (Wait)
+
+                Use these indicators to help you:
+                - **SMA & EMA crossover**: Buy if short > long, Sell if short < long.
+                - **MACD**: Buy if MACD > Signal, Sell if MACD < Signal.
+                - **RSI**: Buy if RSI < 30, Sell if RSI > 70.
+                - **Bollinger Bands**: Buy if close < lower band, Sell if close > upper band.
+                - **Stochastic Oscillator**: Buy if %K < 20 and rising above %D, Sell if %K > 80 and falling below %D.
+
+                ### Step-by-step Reasoning Process (Chain of Thought):
+
+                1.  **Evaluate Each Technical Indicator:** Apply each technical analysis strategy provided in the input prompt (e.g., RSI, MACD, Moving Averages). For each indicator, determine its individual signal: Buy, Sell, or Neutral/Wait. Tally the results to establish a preliminary score.
+
+                2.  **Incorporate External Factors:** Search the web for the most relevant gold-related news from the last two days. Analyze the headlines and summaries to gauge market sentiment. Categorize the overall news tone as Bullish (e.g., economic uncertainty, inflation data), Bearish (e.g., strong dollar, rising yields), or Neutral.
+
+                3.  **Integrate All Signals:** Synthesize the technical indicator score with the news sentiment. A strong consensus from indicators can be reinforced or contradicted by news; conflicting indicators require heavier weighting of the news context.
+
+                4.  **Analyze Scenarios with Different Focuses:** Formulate at least three distinct potential decisions by emphasizing different input variables:
+                    -   **Technical-Focused Decision:** Prioritize the signals from the majority of indicators, potentially overlooking minor news.
+                    -   **News-Driven Decision:** Prioritize the prevailing market sentiment from recent news, potentially overriding mixed technical signals.
+                    -   **Risk-Averse Decision:** Favor a "Wait" or neutral stance in cases of strong conflict between technicals and news or high market uncertainty.
+
+                5.  **Make a Final Decision:** Based on the integrated analysis and scenario evaluation, choose the most prudent action:
+                    -   `0` for **Sell**
+                    -   `1` for **Buy**
+                    -   `2` for **Wait**
+                    The final reasoning must explicitly reference both the technical indicators and the news sentiment.
+
+                Give your answer in this format:
+                {{
+                "explanation": "A detailed explanation of how indicators influenced your strategy.",
+                "action":Based on the data from all the days provided, determine the action (buy, sell, or wait) for the single day immediately following the last given date
+                }}
+
+                Here is the input data:
+
+                {indicators}
+                
+                ALWAYS USE ALL THE TOOLS ALSO SEARCH THE WEB FOR GETTING NEWS CONTENT
+                USE ONLY THE LAST TWO DAYS NEWS.
+                """
+
+FEWSHOT_USER_PROMPT = """
+                You are a trading assistant. Based on the daily technical indicators and gold price open/close values, decide whether the strategy for future day is:
+                - 1 → Buy
+                - 0 → Sell
+                - 2 → Neutral (Wait)
+
+                Use these indicators to help you:
+                - **SMA & EMA crossover**: Buy if short > long, Sell if short < long.
+                - **MACD**: Buy if MACD > Signal, Sell if MACD < Signal.
+                - **RSI**: Buy if RSI < 30, Sell if RSI > 70.
+                - **Bollinger Bands**: Buy if close < lower band, Sell if close > upper band.
+                - **Stochastic Oscillator**: Buy if %K < 20 and rising above %D, Sell if %K > 80 and falling below %D.
+
+                Give your answer in this format:
+                {{
+                "explanation": "A detailed explanation of how indicators influenced your strategy.",
+                "action":Based on the data from all the days provided, determine the action (buy, sell, or wait) for the single day immediately following the last given date
+                }}
+
+                Here is the input data:
+
+                {indicators}
+
+                I give some examples
+
+                • Example 1  
+                Input Data:  
+                • 2020-01-10: open = 2840.50, close = 2875.20, sma_cross = 1, ema_cross = 1, rsi_signal = 0, macd_signal = 1, bollinger_signal = 0, stoch_signal = 0, williams_signal = 1, cci_signal = 1, roc_signal = 1, adx_trend = 1, vortex_signal = 1, obv_signal = 1, final_decision = 1  
+                • 2020-01-13: open = 2870.30, close = 2882.90, sma_cross = 1, ema_cross = 1, rsi_signal = 0, macd_signal = 1, bollinger_signal = 0, stoch_signal = 0, williams_signal = 1, cci_signal = 1, roc_signal = 1, adx_trend = 1, vortex_signal = 1, obv_signal = 1, final_decision = 1  
+                News (last two days): Dollar weakens, geopolitical tensions rise.  
+                Output:  
+                {{
+                "explanation": "Most indicators show bullish momentum, and supportive news confirms upside potential.",
+                "action": 1
+                }}
+
+                • Example 2  
+                Input Data:  
+                • 2020-01-20: open = 2910.70, close = 2888.40, sma_cross = 0, ema_cross = 0, rsi_signal = 1, macd_signal = 0, bollinger_signal = 1, stoch_signal = 1, williams_signal = 0, cci_signal = 0, roc_signal = 0, adx_trend = 0, vortex_signal = 0, obv_signal = 0, final_decision = 0  
+                • 2020-01-21: open = 2887.50, close = 2865.90, sma_cross = 0, ema_cross = 0, rsi_signal = 1, macd_signal = 0, bollinger_signal = 1, stoch_signal = 1, williams_signal = 0, cci_signal = 0, roc_signal = 0, adx_trend = 0, vortex_signal = 0, obv_signal = 0, final_decision = 0  
+                News (last two days): Strong US jobs data, Treasury yields higher.  
+                Output:  
+                {{
+                "explanation": "Indicators point to overbought and weakening momentum. News is bearish, confirming a sell bias.",
+                "action": 0
+                }}
+
+                • Example 3  
+                Input Data:  
+                • 2020-01-27: open = 2855.00, close = 2860.40, sma_cross = 0, ema_cross = 0, rsi_signal = 2, macd_signal = 2, bollinger_signal = 2, stoch_signal = 2, williams_signal = 2, cci_signal = 2, roc_signal = 2, adx_trend = 2, vortex_signal = 2, obv_signal = 2, final_decision = 2  
+                • 2020-01-28: open = 2862.30, close = 2861.10, sma_cross = 0, ema_cross = 0, rsi_signal = 2, macd_signal = 2, bollinger_signal = 2, stoch_signal = 2, williams_signal = 2, cci_signal = 2, roc_signal = 2, adx_trend = 2, vortex_signal = 2, obv_signal = 2, final_decision = 2  
+                News (last two days): Mixed signals—Fed minutes neutral, inflation data stable.  
+                Output:  
+                {{
+                "explanation": "Technical indicators are flat/neutral and news offers no strong direction. Waiting is prudent.",
+                "action": 2
+                }}
+                
+                ALWAYS USE ALL THE TOOLS ALSO SEARCH THE WEB FOR GETTING NEWS CONTENT
+                USE ONLY THE LAST TWO DAYS NEWS.
+                """
+PROMPT_TEMPLATES = {
+    "SIMPLE": SIMPLE_USER_PROMPT,
+    "COT": COT_USER_PROMPT,
+    "FEWSHOT": FEWSHOT_USER_PROMPT,
+}
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    import tiktoken
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Token count of ``text`` for ``model``; roughly len/4 when tiktoken isn't installed."""
+    try:
+        return len(_encoding(model).encode(text))
+    except ImportError:
+        return (len(text) + 3) // 4
+
+
+class PromptTemplate:
+    """A prompt template parsed once into literal chunks and field names."""
+
+    def __init__(self, template: str):
+        self.parts = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+    def render(self, **fields) -> str:
+        return "".join(literal + (fields[field] if field is not None else "") for literal, field in self.parts)
+
+
+class PromptBuilder:
+    """
+    Renders the user prompt for one inference type.
+
+    Templates are compiled when the builder is created. The indicator block is
+    rendered once per (window, file) and shared by every inference type, so
+    only the selected prompt is ever built. ``metrics_hook``, when set, is
+    called with a dict of prompt metrics (including its token count) for
+    every prompt built.
+    """
+
+    def __init__(self, templates: Dict[str, str] = None, model: str = "gpt-4o-mini",
+                 metrics_hook: Optional[Callable[[dict], None]] = None):
+        templates = PROMPT_TEMPLATES if templates is None else templates
+        self.templates = {name: PromptTemplate(t) for name, t in templates.items()}
+        self.model = model
+        self.metrics_hook = metrics_hook
+        # (window key, rendered block), swapped as one tuple so concurrent runs never mix windows
+        self._indicators = (None, None)
+
+    def indicators(self, start_date: str, end_date: str, numerical_csv: str) -> str:
+        key = (start_date, end_date, numerical_csv)
+        cached_key, block = self._indicators
+        if cached_key != key:
+            block = get_technical_indicators_in_range_from_csv(start_date, end_date, numerical_csv)
+            self._indicators = (key, block)
+        return block
+
+    def build(self, inference_type: str, start_date: str, end_date: str, numerical_csv: str) -> str:
+        template = self.templates.get(inference_type)
+        if template is None:
+            raise ValueError(f"Inference type '{inference_type}' is not valid. "
+                             f"Valid options are: {', '.join(self.templates)}")
+        prompt = template.render(indicators=self.indicators(start_date, end_date, numerical_csv))
+        if self.metrics_hook is not None:
+            self.metrics_hook({
+                "inference_type": inference_type,
+                "start_date": start_date,
+                "end_date": end_date,
+                "prompt_chars": len(prompt),
+                "prompt_tokens": count_tokens(prompt, self.model),
+            })
+        return prompt
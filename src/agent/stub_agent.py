@@ -0,0 +1,42 @@
+import hashlib
+import json
+import threading
+import time
+
+from src.agent.prompts import PromptBuilder
+
+
+class StubRateLimitError(Exception):
+    """Stands in for openai.RateLimitError."""
+    status_code = 429
+
+
+class StubTradingAgent:
+    """
+    Offline stand-in for GoldTradingAgent with the same ``run`` signature.
+
+    It builds the real prompt (so prompt/indicator costs are measured) and
+    then sleeps ``latency`` seconds instead of calling the LLM. Every
+    ``rate_limit_every``-th call raises a 429 to exercise the backoff. The
+    action is a deterministic function of the window, so serial and
+    concurrent runs can be compared.
+    """
+
+    def __init__(self, latency=0.5, rate_limit_every=0, metrics_hook=None):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.prompts = PromptBuilder(metrics_hook=metrics_hook)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def run(self, start_date: str, end_date: str, news_csv: str, numerical_csv: str, inference_type: str) -> str:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if self.rate_limit_every and call % self.rate_limit_every == 0:
+            raise StubRateLimitError(f"stub rate limit on call {call}")
+
+        prompt = self.prompts.build(inference_type, start_date, end_date, numerical_csv)
+        time.sleep(self.latency)
+        action = int(hashlib.md5(f"{start_date}|{end_date}|{inference_type}".encode()).hexdigest(), 16) % 3
+        return json.dumps({"explanation": f"stub response to a {len(prompt)}-character prompt", "action": action})
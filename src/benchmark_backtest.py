@@ -0,0 +1,50 @@
+"""
+Benchmarks the concurrent choose_actions scheduler offline against the stub LLM.
+
+    python -m src.benchmark_backtest --days 365 --latency 0.5 --concurrency 1 8 32
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import yaml
+
+from src.agent.stub_agent import StubTradingAgent
+from src.run import choose_actions
+
+
+def run_benchmark(config, days, latency, concurrencies, rate_limit_every=0):
+    config = dict(config)
+    start = datetime.strptime(config["dates"]["start_date"], "%Y-%m-%d %H:%M:%S")
+    end = start + timedelta(days=config["hyps"]["lookback"] + days - 1)
+    config["dates"] = {**config["dates"], "end_date": end.strftime("%Y-%m-%d %H:%M:%S")}
+    # keep backoff short so injected rate limits don't dominate the timing
+    config["hyps"] = {**config["hyps"], "rate_limit_base_delay": min(latency, 0.1)}
+    # no checkpointing, otherwise every run after the first would be served from the store
+    config["paths"] = {**config["paths"], "results": None}
+
+    baseline = None
+    for concurrency in concurrencies:
+        agent = StubTradingAgent(latency=latency, rate_limit_every=rate_limit_every)
+        t0 = time.perf_counter()
+        dates, responses = choose_actions(agent, config, concurrency=concurrency)
+        elapsed = time.perf_counter() - t0
+        if baseline is None:
+            baseline = (elapsed, responses)
+        assert responses == baseline[1], "concurrent run returned different or reordered responses"
+        print(f"concurrency {concurrency:>3}: {len(dates)} days in {elapsed:7.2f}s "
+              f"({baseline[0] / elapsed:5.1f}x, {agent.calls} calls)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", default="configs/run_pipline.yaml")
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as file:
+        config = yaml.safe_load(file)
+    run_benchmark(config, args.days, args.latency, args.concurrency, args.rate_limit_every)
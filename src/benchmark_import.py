@@ -0,0 +1,60 @@
+"""
+Measures cold import time of the agent modules in fresh interpreters and fails
+when any exceeds its budget (worker processes pay this on every respawn).
+
+    python -m src.benchmark_import --budget 1.5
+"""
+import argparse
+import re
+import subprocess
+import sys
+import time
+
+MODULES = ["src.agent.agent", "src.agent.numerical_agent", "src.agent.goldapi", "src.run"]
+# Must not be imported as a side effect of importing the modules above
+LAZY_MODULES = ["langchain_openai", "langchain_core", "langgraph", "openai", "langchain_community", "yfinance", "duckduckgo_search"]
+
+
+def time_import(module: str, repeat: int = 5) -> float:
+    """Best wall time of ``python -c "import <module>"`` over ``repeat`` fresh processes."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def eager_imports(module: str):
+    """Heavy SDK packages that ``module`` pulls in at import time, with their cumulative import time (s)."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         check=True, capture_output=True, text=True).stderr
+    found = {}
+    for line in out.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", line)
+        if match and match.group(2) in LAZY_MODULES:
+            found[match.group(2)] = int(match.group(1)) / 1e6
+    return found
+
+
+def run_benchmark(budget: float, repeat: int, modules=MODULES) -> bool:
+    baseline = time_import("sys", repeat)
+    ok = True
+    for module in modules:
+        elapsed = time_import(module, repeat) - baseline
+        eager = eager_imports(module)
+        status = "ok" if elapsed <= budget and not eager else "FAIL"
+        ok &= status == "ok"
+        print(f"{module:<28} {elapsed:6.3f}s (budget {budget:.2f}s) {status}")
+        for name, seconds in eager.items():
+            print(f"    imports {name} eagerly ({seconds:.3f}s)")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=1.5, help="seconds per module, interpreter startup excluded")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.budget, args.repeat, args.modules) else 1)
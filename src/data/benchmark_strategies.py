@@ -0,0 +1,261 @@
+"""
+Benchmarks the registry-based evaluate_all_strategies against the previous
+pandas implementation on synthetic 10+ year daily and minute bars.
+
+    python -m src.data.benchmark_strategies --years 12 --repeat 3
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.numerical_feature_extractor import evaluate_all_strategies
+from src.data.strategy_signals import SignalMatrix, evaluate_signals
+
+
+# Previous implementation, kept verbatim for comparison (fillna(method=...) spelled ffill()/bfill()).
+def evaluate_all_strategies_legacy(df: pd.DataFrame, short_win=10, long_win=30, rsi_thresh=30) -> pd.DataFrame:
+    import warnings
+    warnings.filterwarnings("ignore", category=RuntimeWarning)  # suppress some warnings for clean output
+
+    def safe_align_compare(s1, s2, op):
+        """
+        Align two series s1 and s2 on index, convert to float, fill NaNs forward,
+        and perform element-wise comparison given by op function (like operator.gt).
+        Returns boolean Series or all False if error.
+        """
+        try:
+            s1a, s2a = s1.align(s2, join='inner')
+            s1a = s1a.astype(float).ffill().bfill()
+            s2a = s2a.astype(float).ffill().bfill()
+            return op(s1a, s2a).reindex(df.index, fill_value=False)
+        except Exception as e:
+            print(f"Warning in safe_align_compare: {e}")
+            return pd.Series(False, index=df.index)
+
+    import operator
+    strategy_df = pd.DataFrame(index=df.index)
+
+    # --- SMA cross ---
+    sma_short_col = f'sma_{short_win}'
+    sma_long_col = f'sma_{long_win}'
+    if sma_short_col in df.columns and sma_long_col in df.columns:
+        prev_short = df[sma_short_col].shift(1)
+        prev_long = df[sma_long_col].shift(1)
+        curr_short = df[sma_short_col]
+        curr_long = df[sma_long_col]
+        buy = safe_align_compare(prev_short, prev_long, operator.lt) & safe_align_compare(curr_short, curr_long, operator.gt)
+        sell = safe_align_compare(prev_short, prev_long, operator.gt) & safe_align_compare(curr_short, curr_long, operator.lt)
+        strategy_df['sma_cross'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['sma_cross'] = 0
+
+    # --- EMA cross ---
+    ema_short_col = f'ema_{short_win}'
+    ema_long_col = f'ema_{long_win}'
+    if ema_short_col in df.columns and ema_long_col in df.columns:
+        prev_short = df[ema_short_col].shift(1)
+        prev_long = df[ema_long_col].shift(1)
+        curr_short = df[ema_short_col]
+        curr_long = df[ema_long_col]
+        buy = safe_align_compare(prev_short, prev_long, operator.lt) & safe_align_compare(curr_short, curr_long, operator.gt)
+        sell = safe_align_compare(prev_short, prev_long, operator.gt) & safe_align_compare(curr_short, curr_long, operator.lt)
+        strategy_df['ema_cross'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['ema_cross'] = 0
+
+    # --- RSI ---
+    if 'rsi' in df.columns:
+        rsi = df['rsi'].astype(float).ffill().bfill()
+        buy = rsi < rsi_thresh
+        sell = rsi > 70
+        strategy_df['rsi_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['rsi_signal'] = 0
+
+    # --- MACD ---
+    if 'macd' in df.columns and 'macd_signal' in df.columns:
+        buy = safe_align_compare(df['macd'], df['macd_signal'], operator.gt)
+        sell = safe_align_compare(df['macd'], df['macd_signal'], operator.lt)
+        strategy_df['macd_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['macd_signal'] = 0
+
+    # --- Bollinger Bands ---
+    if 'bb_lower' in df.columns and 'bb_upper' in df.columns:
+        close = df['close'].astype(float).ffill().bfill()
+        buy = close < df['bb_lower']
+        sell = close > df['bb_upper']
+        strategy_df['bollinger_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['bollinger_signal'] = 0
+
+    # --- Stochastic ---
+    if 'stoch_k' in df.columns and 'stoch_d' in df.columns:
+        stoch_k = df['stoch_k'].astype(float).ffill().bfill()
+        stoch_d = df['stoch_d'].astype(float).ffill().bfill()
+        buy = (stoch_k < 20) & (stoch_k > stoch_d)
+        sell = (stoch_k > 80) & (stoch_k < stoch_d)
+        strategy_df['stoch_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['stoch_signal'] = 0
+
+    # --- Williams %R ---
+    if 'williams_r' in df.columns:
+        willr = df['williams_r'].astype(float).ffill().bfill()
+        buy = willr < -80
+        sell = willr > -20
+        strategy_df['williams_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['williams_signal'] = 0
+
+    # --- CCI ---
+    if 'cci' in df.columns:
+        cci = df['cci'].astype(float).ffill().bfill()
+        buy = cci < -100
+        sell = cci > 100
+        strategy_df['cci_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['cci_signal'] = 0
+
+    # --- ROC ---
+    if 'roc' in df.columns:
+        roc = df['roc'].astype(float).ffill().bfill()
+        buy = roc > 0
+        sell = roc < 0
+        strategy_df['roc_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['roc_signal'] = 0
+
+    # --- ADX ---
+    if 'adx' in df.columns:
+        adx = df['adx'].astype(float).ffill().bfill()
+        trending = adx > 25
+        # ADX doesn't indicate direction, so 2 = trending (buy), 0 neutral
+        strategy_df['adx_trend'] = np.where(trending, 2, 0)
+    else:
+        strategy_df['adx_trend'] = 0
+
+    # --- Vortex ---
+    if 'vortex_pos' in df.columns and 'vortex_neg' in df.columns:
+        vortex_pos = df['vortex_pos'].astype(float).ffill().bfill()
+        vortex_neg = df['vortex_neg'].astype(float).ffill().bfill()
+        buy = vortex_pos > vortex_neg
+        sell = vortex_pos < vortex_neg
+        strategy_df['vortex_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['vortex_signal'] = 0
+
+    # --- OBV ---
+    if 'obv' in df.columns:
+        obv_diff = df['obv'].diff().fillna(0)
+        buy = obv_diff > 0
+        sell = obv_diff < 0
+        strategy_df['obv_signal'] = np.select([buy, sell], [2,1], default=0)
+    else:
+        strategy_df['obv_signal'] = 0
+
+    # --- Final decision by majority vote ---
+    buy_votes = (strategy_df == 2).sum(axis=1)
+    sell_votes = (strategy_df == 1).sum(axis=1)
+
+    strategy_df['final_decision'] = np.select(
+        [buy_votes > sell_votes, sell_votes > buy_votes],
+        [1, 0], default=2
+    )
+
+    # strategy_df['open'] = df['open']
+    # strategy_df['close'] = df['close']
+
+    return strategy_df
+
+
+def synthetic_features(n_rows: int, freq: str, seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLCV with indicator columns in realistic ranges and leading nans."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2010-01-01", periods=n_rows, freq=freq)
+    close = pd.Series(1500 * np.exp(np.cumsum(rng.normal(0, 0.002, n_rows))), index=index)
+    df = pd.DataFrame({'open': close.shift(1).fillna(close.iloc[0]), 'close': close}, index=index)
+    for p in (10, 20, 30, 50):
+        df[f'sma_{p}'] = close.rolling(p).mean()
+        df[f'ema_{p}'] = close.ewm(span=p, min_periods=p, adjust=False).mean()
+    fast = close.ewm(span=12, adjust=False).mean()
+    slow = close.ewm(span=26, adjust=False).mean()
+    df['macd'] = fast - slow
+    df['macd_signal'] = df['macd'].ewm(span=9, min_periods=9, adjust=False).mean()
+    std = close.rolling(20).std(ddof=0)
+    df['bb_upper'] = df['sma_20'] + 2 * std
+    df['bb_lower'] = df['sma_20'] - 2 * std
+
+    def bounded(low, high, warmup):
+        values = rng.uniform(low, high, n_rows)
+        values[:warmup] = np.nan
+        return values
+
+    df['rsi'] = bounded(0, 100, 14)
+    df['stoch_k'] = bounded(0, 100, 14)
+    df['stoch_d'] = bounded(0, 100, 16)
+    df['williams_r'] = bounded(-100, 0, 14)
+    df['cci'] = bounded(-250, 250, 20)
+    df['roc'] = bounded(-5, 5, 10)
+    df['adx'] = bounded(0, 60, 27)
+    df['vortex_pos'] = bounded(0.5, 1.5, 14)
+    df['vortex_neg'] = bounded(0.5, 1.5, 14)
+    df['obv'] = np.cumsum(rng.integers(-500, 500, n_rows))
+    return df
+
+
+def _best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_benchmark(years=12, repeat=3, minute=True, sweep=20):
+    cases = [("daily", years * 252, "B")]
+    if minute:
+        cases.append(("minute", years * 252 * 390, "min"))
+
+    for label, n_rows, freq in cases:
+        df = synthetic_features(n_rows, freq)
+        legacy_time, legacy = _best_of(lambda: evaluate_all_strategies_legacy(df, 10, 30, 30), repeat)
+        new_time, new = _best_of(lambda: evaluate_all_strategies(df, 10, 30, 30), repeat)
+        same = legacy.astype(np.int64).equals(new.astype(np.int64))
+        print(
+            f"{label:>6} ({n_rows:,} rows): legacy {legacy_time * 1000:9.1f} ms | "
+            f"registry {new_time * 1000:8.1f} ms | speedup {legacy_time / new_time:6.1f}x | "
+            f"identical output: {same}"
+        )
+
+        # threshold grid search: the matrix is built once and reused for every grid point
+        thresholds = np.linspace(20, 40, sweep)
+
+        def sweep_legacy():
+            for t in thresholds:
+                evaluate_all_strategies_legacy(df, 10, 30, t)
+
+        def sweep_registry():
+            matrix = SignalMatrix(df)
+            for t in thresholds:
+                evaluate_signals(short_win=10, long_win=30, rsi_thresh=t, matrix=matrix)
+
+        legacy_time, _ = _best_of(sweep_legacy, 1)
+        new_time, _ = _best_of(sweep_registry, 1)
+        print(
+            f"{label:>6} sweep of {sweep} thresholds: legacy {legacy_time * 1000:9.1f} ms | "
+            f"registry {new_time * 1000:8.1f} ms | speedup {legacy_time / new_time:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sweep", type=int, default=20)
+    parser.add_argument("--daily-only", action="store_true")
+    args = parser.parse_args()
+    run_benchmark(args.years, args.repeat, minute=not args.daily_only, sweep=args.sweep)
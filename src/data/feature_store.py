@@ -0,0 +1,85 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Rows per Parquet row group. Each group carries min/max date statistics, so a
+# date-range read only decodes the groups overlapping the range.
+ROW_GROUP_SIZE = 4096
+
+
+def _is_parquet(path: str) -> bool:
+    return path.endswith(".parquet")
+
+
+class FeatureStore:
+    """
+    Date-keyed feature table backed by a single Parquet file.
+
+    Reads are memory-mapped and use predicate pushdown on ``date`` plus column
+    projection, so a backtest step only touches the rows and columns it needs.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def write(self, df: pd.DataFrame):
+        """Replaces the store with ``df`` (date index or 'date' column), sorted and de-duplicated by date."""
+        frame = df.reset_index() if 'date' not in df.columns else df.copy()
+        frame['date'] = pd.to_datetime(frame['date'])
+        frame = frame.drop_duplicates(subset='date', keep='last').sort_values('date', ignore_index=True)
+        # Parquet needs unique names; suffix repeats the way read_csv does ('macd_signal' -> 'macd_signal.1')
+        seen = {}
+        names = []
+        for name in frame.columns:
+            names.append(f"{name}.{seen[name]}" if name in seen else name)
+            seen[name] = seen.get(name, 0) + 1
+        frame.columns = names
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        pq.write_table(table, self.path, row_group_size=ROW_GROUP_SIZE)
+
+    def append(self, df: pd.DataFrame):
+        """Adds (or overwrites) the dates in ``df``."""
+        if not self.exists():
+            return self.write(df)
+        new = df.reset_index() if 'date' not in df.columns else df
+        return self.write(pd.concat([self.read(index=False), new], ignore_index=True))
+
+    def read(self, start=None, end=None, columns=None, index=True) -> pd.DataFrame:
+        """Rows with start <= date <= end (either bound optional), restricted to ``columns``."""
+        filters = []
+        if start is not None:
+            filters.append(('date', '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append(('date', '<=', pd.Timestamp(end)))
+        if columns is not None:
+            columns = ['date'] + [c for c in columns if c != 'date']
+        table = pq.read_table(self.path, columns=columns, filters=filters or None, memory_map=True)
+        df = table.to_pandas()
+        return df.set_index('date') if index else df
+
+
+def save_features(df: pd.DataFrame, path: str):
+    """Writes a date-indexed frame to ``path``: Parquet store for '.parquet', CSV otherwise."""
+    if _is_parquet(path):
+        FeatureStore(path).write(df)
+    else:
+        df.to_csv(path)
+
+
+def load_features(path: str, start=None, end=None, columns=None) -> pd.DataFrame:
+    """Date-range read with a 'date' column from either a Parquet store or a CSV written by ``save_features``."""
+    if _is_parquet(path):
+        return FeatureStore(path).read(start, end, columns, index=False)
+    usecols = None if columns is None else ['date'] + [c for c in columns if c != 'date']
+    df = pd.read_csv(path, parse_dates=["date"], usecols=usecols)
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df["date"] >= pd.to_datetime(start)
+    if end is not None:
+        mask &= df["date"] <= pd.to_datetime(end)
+    return df.loc[mask] if usecols is None else df.loc[mask, usecols]
@@ -0,0 +1,503 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import yaml
+
+
+def _div(a, b):
+    """Float division with numpy semantics (x/0 -> ±inf, 0/0 -> nan) instead of raising."""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class RollingSum:
+    """Fixed-size window with a running sum; value is nan until the window is full."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.nan_count = 0
+
+    def update(self, x):
+        self.values.append(x)
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            self.total += x
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+        if len(self.values) < self.window or self.nan_count:
+            return math.nan
+        return self.total
+
+
+class RollingMean(RollingSum):
+    def update(self, x):
+        return super().update(x) / self.window
+
+
+class RollingStd:
+    """Sliding-window population std (ddof=0) using Welford's add/remove update."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x):
+        self.values.append(x)
+        n = len(self.values)
+        if n <= self.window:
+            delta = x - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (x - self.mean)
+        else:
+            old = self.values.popleft()
+            new_mean = self.mean + (x - old) / self.window
+            self.m2 += (x - old) * (x - new_mean + old - self.mean)
+            self.mean = new_mean
+        if n < self.window:
+            return math.nan, math.nan
+        return self.mean, math.sqrt(max(self.m2, 0.0) / self.window)
+
+
+class RollingExtreme:
+    """Rolling max (or min) over a fixed window using a monotonic deque, amortised O(1)."""
+
+    def __init__(self, window, mode="max"):
+        self.window = window
+        self.is_max = mode == "max"
+        self.candidates = deque()  # (position, value)
+        self.position = 0
+
+    def update(self, x):
+        better = (lambda a, b: a >= b) if self.is_max else (lambda a, b: a <= b)
+        while self.candidates and better(x, self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append((self.position, x))
+        if self.candidates[0][0] <= self.position - self.window:
+            self.candidates.popleft()
+        self.position += 1
+        if self.position < self.window:
+            return math.nan
+        return self.candidates[0][1]
+
+
+class EWM:
+    """pandas ``ewm(adjust=False, min_periods=...)`` for a stream that may start with nans."""
+
+    def __init__(self, alpha, min_periods):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = math.nan
+        self.count = 0
+
+    def update(self, x):
+        if not math.isnan(x):
+            self.count += 1
+            if math.isnan(self.value):
+                self.value = x
+            else:
+                self.value = (1 - self.alpha) * self.value + self.alpha * x
+        if self.count < self.min_periods:
+            return math.nan
+        return self.value
+
+
+class Wilder:
+    """ta-style Wilder average: 0 before the seed bar, seeded with a plain mean, then (prev*(n-1)+x)/n."""
+
+    def __init__(self, window):
+        self.window = window
+        self.seed = []
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.seed.append(x)
+            if len(self.seed) < self.window:
+                return 0.0
+            self.value = sum(self.seed) / self.window
+            self.seed = None
+            return self.value
+        self.value = (self.value * (self.window - 1) + x) / float(self.window)
+        return self.value
+
+
+class SMA:
+    def __init__(self, period):
+        self.columns = [f'sma_{period}']
+        self.mean = RollingMean(period)
+
+    def update(self, bar):
+        return [self.mean.update(bar['close'])]
+
+
+class EMA:
+    def __init__(self, period):
+        self.columns = [f'ema_{period}']
+        self.ema = EWM(2 / (period + 1), period)
+
+    def update(self, bar):
+        return [self.ema.update(bar['close'])]
+
+
+class MACDState:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.columns = ['macd', 'macd_signal', 'macd_diff']
+        self.fast = EWM(2 / (fast + 1), fast)
+        self.slow = EWM(2 / (slow + 1), slow)
+        self.signal = EWM(2 / (signal + 1), signal)
+
+    def update(self, bar):
+        macd = self.fast.update(bar['close']) - self.slow.update(bar['close'])
+        signal = self.signal.update(macd)
+        return [macd, signal, macd - signal]
+
+
+class RSIState:
+    def __init__(self, period):
+        self.columns = ['rsi']
+        self.up = EWM(1 / period, period)
+        self.down = EWM(1 / period, period)
+        self.prev_close = None
+
+    def update(self, bar):
+        diff = 0.0 if self.prev_close is None else bar['close'] - self.prev_close
+        self.prev_close = bar['close']
+        emaup = self.up.update(max(diff, 0.0))
+        emadn = self.down.update(-min(diff, 0.0))
+        if emadn == 0:
+            return [100.0]
+        return [100 - 100 / (1 + _div(emaup, emadn))]
+
+
+class StochasticState:
+    def __init__(self, k_window, d_window):
+        self.columns = ['stoch_k', 'stoch_d']
+        self.low = RollingExtreme(k_window, "min")
+        self.high = RollingExtreme(k_window, "max")
+        self.d = RollingMean(d_window)
+
+    def update(self, bar):
+        smin = self.low.update(bar['low'])
+        smax = self.high.update(bar['high'])
+        stoch_k = _div(100 * (bar['close'] - smin), smax - smin)
+        return [stoch_k, self.d.update(stoch_k)]
+
+
+class WilliamsRState:
+    def __init__(self, period):
+        self.columns = ['williams_r']
+        self.high = RollingExtreme(period, "max")
+        self.low = RollingExtreme(period, "min")
+
+    def update(self, bar):
+        hh = self.high.update(bar['high'])
+        ll = self.low.update(bar['low'])
+        return [_div(-100 * (hh - bar['close']), hh - ll)]
+
+
+class CCIState:
+    """CCI needs the mean absolute deviation of the window, so this one is O(period) per bar."""
+
+    def __init__(self, period, constant=0.015):
+        self.columns = ['cci']
+        self.period = period
+        self.constant = constant
+        self.window = deque(maxlen=period)
+        self.mean = RollingMean(period)
+
+    def update(self, bar):
+        tp = (bar['high'] + bar['low'] + bar['close']) / 3.0
+        self.window.append(tp)
+        mean = self.mean.update(tp)
+        if math.isnan(mean):
+            return [math.nan]
+        mad = sum(abs(x - mean) for x in self.window) / self.period
+        return [_div(tp - mean, self.constant * mad)]
+
+
+class ROCState:
+    def __init__(self, period):
+        self.columns = ['roc']
+        self.closes = deque(maxlen=period + 1)
+
+    def update(self, bar):
+        self.closes.append(bar['close'])
+        if len(self.closes) <= self.closes.maxlen - 1:
+            return [math.nan]
+        past = self.closes[0]
+        return [_div(bar['close'] - past, past) * 100]
+
+
+class ATRState:
+    def __init__(self, period):
+        self.columns = ['atr']
+        self.wilder = Wilder(period)
+        self.prev_close = None
+
+    def update(self, bar):
+        tr = bar['high'] - bar['low']
+        if self.prev_close is not None:
+            tr = max(tr, abs(bar['high'] - self.prev_close), abs(bar['low'] - self.prev_close))
+        self.prev_close = bar['close']
+        return [self.wilder.update(tr)]
+
+
+class BollingerState:
+    def __init__(self, period, window_dev=2):
+        self.columns = ['bb_upper', 'bb_middle', 'bb_lower']
+        self.std = RollingStd(period)
+        self.window_dev = window_dev
+
+    def update(self, bar):
+        mavg, mstd = self.std.update(bar['close'])
+        return [mavg + self.window_dev * mstd, mavg, mavg - self.window_dev * mstd]
+
+
+class DonchianState:
+    def __init__(self, period):
+        self.columns = ['donchian_upper', 'donchian_lower']
+        self.high = RollingExtreme(period, "max")
+        self.low = RollingExtreme(period, "min")
+
+    def update(self, bar):
+        return [self.high.update(bar['high']), self.low.update(bar['low'])]
+
+
+class ADXState:
+    """Mirrors ta's ADXIndicator: Wilder-smoothed TR/+DM/-DM from bar ``period``, ADX seeded at bar 2*period-1."""
+
+    def __init__(self, period):
+        self.columns = ['adx']
+        self.period = period
+        self.bars_seen = 0
+        self.prev = None
+        self.trs = self.dip = self.din = 0.0
+        self.dx_seed = []
+        self.adx = None
+
+    def update(self, bar):
+        w = self.period
+        prev, self.prev = self.prev, bar
+        self.bars_seen += 1
+        if prev is None:
+            return [0.0]
+        dm = max(bar['high'], prev['close']) - min(bar['low'], prev['close'])
+        diff_up = bar['high'] - prev['high']
+        diff_down = prev['low'] - bar['low']
+        pos = diff_up if diff_up > diff_down and diff_up > 0 else 0.0
+        neg = diff_down if diff_down > diff_up and diff_down > 0 else 0.0
+
+        # bars 1..w accumulate a plain sum, later bars use Wilder's smoothing
+        if self.bars_seen <= w + 1:
+            self.trs += dm
+            self.dip += pos
+            self.din += neg
+        else:
+            self.trs = self.trs - self.trs / float(w) + dm
+            self.dip = self.dip - self.dip / float(w) + pos
+            self.din = self.din - self.din / float(w) + neg
+        if self.bars_seen <= w:
+            return [0.0]
+
+        di_pos = 100 * (self.dip / self.trs) if self.trs != 0 else 0.0
+        di_neg = 100 * (self.din / self.trs) if self.trs != 0 else 0.0
+        if di_pos + di_neg != 0:
+            dx = 100 * abs((di_pos - di_neg) / (di_pos + di_neg))
+        else:
+            dx = 0.0
+
+        if self.adx is None:
+            self.dx_seed.append(dx)
+            if len(self.dx_seed) < w:
+                return [0.0]
+            self.adx = sum(self.dx_seed) / w
+            self.dx_seed = None
+        else:
+            self.adx = (self.adx * (w - 1) + dx) / float(w)
+        return [self.adx]
+
+
+class VortexState:
+    def __init__(self, period):
+        self.columns = ['vortex_pos', 'vortex_neg']
+        self.trn = RollingSum(period)
+        self.vmp = RollingSum(period)
+        self.vmm = RollingSum(period)
+        self.prev = None
+
+    def update(self, bar):
+        prev, self.prev = self.prev, bar
+        if prev is None:
+            tr, vmp, vmm = bar['high'] - bar['low'], math.nan, math.nan
+        else:
+            tr = max(bar['high'], prev['close']) - min(bar['low'], prev['close'])
+            vmp = abs(bar['high'] - prev['low'])
+            vmm = abs(bar['low'] - prev['high'])
+        trn = self.trn.update(tr)
+        return [_div(self.vmp.update(vmp), trn), _div(self.vmm.update(vmm), trn)]
+
+
+class OBVState:
+    def __init__(self):
+        self.columns = ['obv']
+        self.obv = 0
+        self.prev_close = None
+
+    def update(self, bar):
+        if self.prev_close is not None and bar['close'] < self.prev_close:
+            self.obv -= bar['volume']
+        else:
+            self.obv += bar['volume']
+        self.prev_close = bar['close']
+        return [self.obv]
+
+
+class ReturnsState:
+    def __init__(self, log=True, simple=True):
+        self.log = log
+        self.simple = simple
+        self.columns = (['log_return'] if log else []) + (['simple_return'] if simple else [])
+        self.prev_close = None
+
+    def update(self, bar):
+        prev, self.prev_close = self.prev_close, bar['close']
+        ratio = math.nan if prev is None else _div(bar['close'], prev)
+        values = []
+        if self.log:
+            values.append(math.log(ratio) if ratio > 0 else math.nan)
+        if self.simple:
+            values.append(ratio - 1)
+        return values
+
+
+class TimeFeaturesState:
+    def __init__(self):
+        self.columns = ['hour_sin', 'hour_cos', 'weekday_sin', 'weekday_cos']
+
+    def update(self, bar):
+        ts = bar['date']
+        return [
+            np.sin(2 * np.pi * ts.hour / 24),
+            np.cos(2 * np.pi * ts.hour / 24),
+            np.sin(2 * np.pi * ts.dayofweek / 7),
+            np.cos(2 * np.pi * ts.dayofweek / 7),
+        ]
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class IncrementalFeatureEngine:
+    """
+    Streaming counterpart of ``calc_strategies_features``'s indicator block.
+
+    Each indicator keeps its own rolling state, so ``update`` appends one bar in
+    O(1) per indicator (CCI is O(window)). Rows match the batch ``ta`` columns,
+    including the leading nans/zeros, before ``dropna`` is applied.
+    """
+
+    def __init__(self, features: dict):
+        self.states = [ReturnsState(features.get('log_return', False), features.get('simple_return', False))]
+        if 'sma' in features:
+            self.states += [SMA(p) for p in features['sma'].get('periods', [])]
+        if 'ema' in features:
+            self.states += [EMA(p) for p in features['ema'].get('periods', [])]
+        if features.get('macd', False):
+            self.states.append(MACDState())
+        if 'rsi' in features:
+            self.states.append(RSIState(features['rsi'].get('period', 14)))
+        if 'stochastic' in features:
+            self.states.append(StochasticState(features['stochastic']['k'], features['stochastic']['d']))
+        if 'williams_r' in features:
+            self.states.append(WilliamsRState(features['williams_r']))
+        if 'cci' in features:
+            self.states.append(CCIState(features['cci']))
+        if 'roc' in features:
+            self.states.append(ROCState(features['roc']))
+        if 'atr' in features:
+            self.states.append(ATRState(features['atr']))
+        if 'bollinger_bands' in features:
+            self.states.append(BollingerState(features['bollinger_bands']))
+        if 'donchian' in features:
+            self.states.append(DonchianState(features['donchian']))
+        if 'adx' in features:
+            self.states.append(ADXState(features['adx']))
+        if 'vortex' in features:
+            self.states.append(VortexState(features['vortex']))
+        if features.get('obv', False):
+            self.states.append(OBVState())
+        if features.get('time_features', False):
+            self.states.append(TimeFeaturesState())
+
+        self.columns = list(OHLCV_COLUMNS)
+        for state in self.states:
+            self.columns += state.columns
+
+    @classmethod
+    def from_config(cls, config_path="configs/run_pipline.yaml"):
+        with open(config_path, 'r') as file:
+            config = yaml.safe_load(file)
+        return cls(config.get('numerical_features', {}))
+
+    def update(self, date, open, high, low, close, volume) -> dict:
+        """Append one bar and return its feature row as a column -> value dict."""
+        bar = {'date': pd.Timestamp(date), 'open': float(open), 'high': float(high),
+               'low': float(low), 'close': float(close), 'volume': volume}
+        values = [bar[col] for col in OHLCV_COLUMNS]
+        for state in self.states:
+            values += state.update(bar)
+        return dict(zip(self.columns, values))
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feed a date-indexed OHLCV frame bar by bar (e.g. to warm up) and return the feature rows."""
+        rows = [
+            self.update(date, o, h, lo, c, v)
+            for date, o, h, lo, c, v in zip(df.index, df['open'], df['high'], df['low'], df['close'], df['volume'])
+        ]
+        return pd.DataFrame(rows, index=df.index, columns=self.columns)
+
+
+if __name__ == "__main__":
+    # Parity check against the batch ta pipeline on the bundled OHLCV history
+    from src.data import numerical_feature_extractor as nfe
+
+    with open("configs/run_pipline.yaml", 'r') as file:
+        config = yaml.safe_load(file)
+    features = config.get('numerical_features', {})
+
+    df = nfe.load_ohlcv("data/gold_ohlcv_2020_2025.csv")
+    batch = nfe.calculate_returns(df.copy(), log=features.get('log_return', False), simple=features.get('simple_return', False))
+    batch = nfe.add_sma(batch, features['sma']['periods'])
+    batch = nfe.add_ema(batch, features['ema']['periods'])
+    batch = nfe.add_macd(batch)
+    batch = nfe.add_rsi(batch, features['rsi']['period'])
+    batch = nfe.add_stochastic(batch, features['stochastic']['k'], features['stochastic']['d'])
+    batch = nfe.add_williams_r(batch, features['williams_r'])
+    batch = nfe.add_cci(batch, features['cci'])
+    batch = nfe.add_roc(batch, features['roc'])
+    batch = nfe.add_atr(batch, features['atr'])
+    batch = nfe.add_bollinger_bands(batch, features['bollinger_bands'])
+    batch = nfe.add_donchian(batch, features['donchian'])
+    batch = nfe.add_adx(batch, features['adx'])
+    batch = nfe.add_vortex(batch, features['vortex'])
+    batch = nfe.add_obv(batch)
+    batch = nfe.add_time_features(batch)
+
+    streamed = IncrementalFeatureEngine(features).update_frame(df)
+    for col in streamed.columns:
+        ok = np.allclose(streamed[col].astype(float), batch[col].astype(float), rtol=1e-9, atol=1e-9, equal_nan=True)
+        print(f"{col:>16}: {'ok' if ok else 'MISMATCH'}")
@@ -0,0 +1,107 @@
+"""
+Coverage and statistics for the news tables, answered with aggregate queries
+over the date and domain indexes (no rows are pulled into Python).
+
+    python -m src.data.news_coverage gdelt_data.db --table raw_news --report raw_news_coverage.json
+"""
+import argparse
+import json
+from datetime import datetime, timedelta
+from statistics import median
+
+from src.data.news_db import connect, distinct_dates, refresh_stats
+
+DATE_FORMAT = "%d %B %Y"  # how raw_news stores dates, e.g. "01 May 2024"
+
+
+def daily_counts(conn, table):
+    """[(date, rows)] per date, in the table's date order."""
+    return conn.execute(f"SELECT date, COUNT(*) FROM {table} GROUP BY date ORDER BY date").fetchall()
+
+
+def domain_histogram(conn, table, limit=20, date=None):
+    """[(domain, rows)] for the ``limit`` most frequent domains, optionally on one date."""
+    refresh_stats(conn, table)
+    where, params = ("WHERE date = ?", (date,)) if date is not None else ("", ())
+    return conn.execute(
+        f"SELECT domain, COUNT(*) AS n FROM {table} {where} GROUP BY domain ORDER BY n DESC LIMIT ?",
+        (*params, limit),
+    ).fetchall()
+
+
+def find_gaps(conn, table, start=None, end=None, date_format=DATE_FORMAT):
+    """
+    Days between ``start`` and ``end`` (datetimes; default: the table's first and last day)
+    with no rows, as strings in ``date_format``. Dates that don't parse are ignored.
+    """
+    present = set()
+    for value in distinct_dates(conn, table):
+        try:
+            present.add(datetime.strptime(value, date_format))
+        except (TypeError, ValueError):
+            continue
+    if not present and (start is None or end is None):
+        return []
+    start = start or min(present)
+    end = end or max(present)
+    gaps = []
+    day = start
+    while day <= end:
+        if day not in present:
+            gaps.append(day.strftime(date_format))
+        day += timedelta(days=1)
+    return gaps
+
+
+def coverage_report(conn, table, top_domains=20, date_format=DATE_FORMAT):
+    """Compact summary of ``table``: row and day counts, per-day distribution, gaps and top domains."""
+    counts = daily_counts(conn, table)
+    per_day = [n for _, n in counts]
+    parsed = []
+    for value, _ in counts:
+        try:
+            parsed.append(datetime.strptime(value, date_format))
+        except (TypeError, ValueError):
+            continue
+    return {
+        "table": table,
+        "rows": sum(per_day),
+        "days": len(counts),
+        "first_day": min(parsed).strftime(date_format) if parsed else None,
+        "last_day": max(parsed).strftime(date_format) if parsed else None,
+        "rows_per_day": {
+            "min": min(per_day) if per_day else 0,
+            "median": median(per_day) if per_day else 0,
+            "max": max(per_day) if per_day else 0,
+        },
+        "gaps": find_gaps(conn, table, date_format=date_format),
+        "top_domains": domain_histogram(conn, table, top_domains),
+        "daily_counts": dict(counts),
+    }
+
+
+def write_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("db_name")
+    parser.add_argument("--table", default="raw_news")
+    parser.add_argument("--top-domains", type=int, default=20)
+    parser.add_argument("--date-format", default=DATE_FORMAT)
+    parser.add_argument("--report", help="write the full report as JSON here")
+    args = parser.parse_args()
+
+    conn = connect(args.db_name)
+    report = coverage_report(conn, args.table, args.top_domains, args.date_format)
+    conn.close()
+    print(f"{report['table']}: {report['rows']} rows over {report['days']} days "
+          f"({report['first_day']} .. {report['last_day']}), {len(report['gaps'])} missing days")
+    print(f"rows per day: {report['rows_per_day']}")
+    for domain, n in report["top_domains"]:
+        print(f"  {domain:<40} {n}")
+    if args.report:
+        write_report(report, args.report)
+        print(f"Report written to {args.report}")
@@ -0,0 +1,215 @@
+"""
+Shared connection settings, schema indexes and migrations for the news SQLite
+databases (gdelt_data.db, filtered_news.db, yahoo_news.db).
+
+    python -m src.data.news_db gdelt_data.db filtered_news.db yahoo_news.db
+"""
+import argparse
+import logging
+import sqlite3
+import time
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# WAL lets readers run while a writer commits; NORMAL sync is durable at checkpoints under WAL
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64 * 1024,  # KiB
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+# lower-cased host of a URL (scheme and path removed), computed by SQLite itself so
+# rows inserted by any writer get it without application code
+_REST = "CASE WHEN instr(url, '://') > 0 THEN substr(url, instr(url, '://') + 3) ELSE url END"
+DOMAIN_SQL = f"lower(CASE WHEN instr({_REST}, '/') > 0 THEN substr({_REST}, 1, instr({_REST}, '/') - 1) ELSE {_REST} END)"
+
+BBC_SITES = ("bbc.co.uk", "bbc.com")
+NYT_SITES = ("nytimes.com",)
+
+
+def connect(db_name, timeout=30.0) -> sqlite3.Connection:
+    """sqlite3 connection with the shared PRAGMAS applied."""
+    conn = sqlite3.connect(db_name, timeout=timeout)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def url_domain(url: str) -> str:
+    """Python mirror of DOMAIN_SQL."""
+    rest = url.split("://", 1)[1] if "://" in url else url
+    return rest.split("/", 1)[0].lower()
+
+
+def _columns(conn, table):
+    # pragma table_xinfo also lists generated columns
+    return [row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")]
+
+
+def _has_leading_index(conn, table, column):
+    for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        info = conn.execute(f"PRAGMA index_info({index[1]})").fetchall()
+        if info and info[0][2] == column:
+            return True
+    return False
+
+
+def _stats_rows(conn, table):
+    try:
+        row = conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? AND idx IS NOT NULL LIMIT 1", (table,)).fetchone()
+    except sqlite3.OperationalError:
+        return None  # no sqlite_stat1 until the first ANALYZE
+    return int(row[0].split()[0]) if row else None
+
+
+def refresh_stats(conn, table, force=False):
+    """
+    Cheap sampled ANALYZE when ``table`` has no statistics or has grown well past them, so
+    the planner skip-scans the date/domain indexes for DISTINCT queries.
+    """
+    if not force:
+        known = _stats_rows(conn, table)
+        rows = conn.execute(f"SELECT max(rowid) FROM {table}").fetchone()[0] or 0
+        if known is not None and rows <= 4 * max(known, 1000):
+            return
+    try:
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute(f"ANALYZE {table}")
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass  # read-only or locked database: keep the old statistics
+
+
+def migrate(conn, table):
+    """
+    Brings ``table`` to the shared schema; safe to run on every open.
+
+    Adds a virtual ``domain`` column derived from ``url`` (no rewrite of existing
+    rows) and indexes on ``domain`` and ``date`` where the table has them.
+    Returns the names of the indexes created.
+    """
+    columns = _columns(conn, table)
+    created = []
+    if "url" in columns and "domain" not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN domain TEXT GENERATED ALWAYS AS ({DOMAIN_SQL}) VIRTUAL")
+        columns.append("domain")
+    for column in ("domain", "date"):
+        if column in columns and not _has_leading_index(conn, table, column):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})")
+            created.append(f"idx_{table}_{column}")
+    conn.commit()
+    if created:
+        refresh_stats(conn, table, force=True)
+    return created
+
+
+def migrate_database(db_name, tables=None):
+    """Migrates every table with a url or date column (or just ``tables``); returns {table: created indexes}."""
+    conn = connect(db_name)
+    try:
+        if tables is None:
+            tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+            tables = [t for t in tables if {"url", "date"} & set(_columns(conn, t))]
+        return {table: migrate(conn, table) for table in tables}
+    finally:
+        conn.close()
+
+
+def distinct_dates(conn, table):
+    """Set of dates in ``table``, read by skipping through the date index."""
+    refresh_stats(conn, table)
+    return set(row[0] for row in conn.execute(f"SELECT DISTINCT date FROM {table}"))
+
+
+def site_domains(conn, table, sites):
+    """Domains in ``table`` that are one of ``sites`` or a subdomain of one (www.bbc.co.uk for bbc.co.uk)."""
+    refresh_stats(conn, table)
+    domains = [row[0] for row in conn.execute(f"SELECT DISTINCT domain FROM {table}") if row[0]]
+    return [d for d in domains if any(d == site or d.endswith("." + site) for site in sites)]
+
+
+def site_rows(conn, table, sites, columns="date, url"):
+    """Rows of ``table`` whose url is on one of ``sites``, via the domain index."""
+    domains = site_domains(conn, table, sites)
+    if not domains:
+        return []
+    placeholders = ", ".join("?" for _ in domains)
+    return conn.execute(f"SELECT {columns} FROM {table} WHERE domain IN ({placeholders})", domains).fetchall()
+
+
+class IngestStats(NamedTuple):
+    rows: int
+    inserted: int
+    seconds: float
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(conn, table, columns, records, key=None, batch_size=50_000) -> IngestStats:
+    """
+    Bulk-inserts an iterable of record tuples (in ``columns`` order), one executemany
+    transaction per ``batch_size`` records, and logs a single summary with rows/s.
+
+    Without ``key`` duplicates are skipped by the table's own constraints (INSERT OR
+    IGNORE). With ``key`` (columns identifying a record, for tables without such a
+    constraint) each batch goes through a temp staging table and only records whose
+    key is not in the table yet, first occurrence within the batch, are inserted.
+    """
+    column_list = ", ".join(columns)
+    placeholders = ", ".join("?" for _ in columns)
+    if key:
+        if not _has_leading_index(conn, table, key[0]):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{key[0]} ON {table}({key[0]})")
+        conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS ingest_{table} AS SELECT {column_list} FROM {table} WHERE 0")
+        matches = " AND ".join(f"t.{k} IS s.{k}" for k in key)
+        key_list = ", ".join(key)
+        merge = f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM temp.ingest_{table} s
+            WHERE s.rowid IN (SELECT min(rowid) FROM temp.ingest_{table} GROUP BY {key_list})
+            AND NOT EXISTS (SELECT 1 FROM {table} t WHERE {matches})
+            ORDER BY s.rowid
+        """
+    rows = inserted = 0
+    t0 = time.perf_counter()
+    for batch in _batches(records, batch_size):
+        with conn:
+            if key:
+                conn.execute(f"DELETE FROM temp.ingest_{table}")
+                conn.executemany(f"INSERT INTO temp.ingest_{table} ({column_list}) VALUES ({placeholders})", batch)
+                before = conn.total_changes
+                conn.execute(merge)
+            else:
+                before = conn.total_changes
+                conn.executemany(f"INSERT OR IGNORE INTO {table} ({column_list}) VALUES ({placeholders})", batch)
+            inserted += conn.total_changes - before
+        rows += len(batch)
+    stats = IngestStats(rows, inserted, time.perf_counter() - t0)
+    logger.info(f"Ingested {stats.rows} rows into {table} ({stats.inserted} new) at {stats.rows_per_second:,.0f} rows/s")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adds the domain column, indexes and WAL mode to existing news databases.")
+    parser.add_argument("databases", nargs="+")
+    args = parser.parse_args()
+    for db_name in args.databases:
+        t0 = time.perf_counter()
+        result = migrate_database(db_name)
+        print(f"{db_name}: {result} in {time.perf_counter() - t0:.1f}s")
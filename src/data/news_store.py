@@ -0,0 +1,105 @@
+"""
+Date-indexed news articles shared by the agent tools.
+
+    python -m src.data.news_store data/merged_news.csv data/merged_news.arrow
+"""
+import argparse
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+
+def _read_table(path: str) -> pa.Table:
+    if path.endswith(".arrow"):
+        # uncompressed Arrow IPC: the table is a view over the mapped file
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if path.endswith(".parquet"):
+        return pq.read_table(path, memory_map=True)
+    return pacsv.read_csv(
+        path,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(column_types={"date": pa.string()}),
+    )
+
+
+class NewsStore:
+    """
+    News articles sorted by date with a date -> row-range index.
+
+    ``articles(date)`` is a zero-copy slice of the day's rows, so a lookup never
+    touches other days. Backed by an Arrow IPC file (memory-mapped), Parquet or
+    the raw news CSV; ``save`` converts to the IPC format.
+    """
+
+    def __init__(self, table: pa.Table, presorted: bool = False):
+        if not presorted:
+            table = table.set_column(table.schema.get_field_index("date"), "date", pc.cast(table["date"], pa.string()))
+            # sort_indices is stable, so articles keep their file order within a day
+            table = table.take(pc.sort_indices(table, sort_keys=[("date", "ascending")]))
+        self.table = table
+        dates = table["date"].to_numpy(zero_copy_only=False)
+        starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]]) if len(dates) else np.array([], dtype=np.int64)
+        ends = np.r_[starts[1:], len(dates)]
+        self.index = {dates[s]: (int(s), int(e - s)) for s, e in zip(starts, ends)}
+
+    @classmethod
+    def open(cls, path: str) -> "NewsStore":
+        table = _read_table(path)
+        # files written by save() are already sorted; index the mapped table without copying it
+        presorted = (table.schema.metadata or {}).get(b"sorted_by") == b"date"
+        return cls(table, presorted=presorted)
+
+    def save(self, path: str):
+        table = self.table.replace_schema_metadata({**(self.table.schema.metadata or {}), b"sorted_by": b"date"})
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    def __contains__(self, date: str):
+        return date in self.index
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def dates(self):
+        return list(self.index)
+
+    def articles(self, date: str, limit: int = None) -> pa.Table:
+        """The day's rows (first ``limit`` of them) as a zero-copy slice; empty when there is no news."""
+        start, length = self.index.get(date, (0, 0))
+        if limit is not None:
+            length = min(length, limit)
+        return self.table.slice(start, length)
+
+    def texts(self, date: str, limit: int = None, column: str = "news_text"):
+        return self.articles(date, limit)[column].to_pylist()
+
+
+# path -> (mtime, NewsStore), shared by every tool in the process
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_news_store(path: str) -> NewsStore:
+    """The process-wide NewsStore for ``path``, reopened only when the file changes."""
+    mtime = os.path.getmtime(path)
+    with _STORES_LOCK:
+        cached = _STORES.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _STORES[path] = (mtime, NewsStore.open(path))
+        return cached[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converts the news CSV into a date-sorted Arrow IPC store.")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args()
+
+    store = NewsStore.open(args.source)
+    store.save(args.target)
+    print(f"Saved {len(store)} articles over {len(store.index)} dates to {args.target}")
@@ -10,6 +10,8 @@ from ta.momentum import (
 from ta.volatility import BollingerBands, AverageTrueRange, DonchianChannel
 from ta.volume import OnBalanceVolumeIndicator
 from datetime import datetime
+from src.data.strategy_signals import evaluate_signals
+from src.data.feature_store import save_features
 
 def load_ohlcv(csv_path: str) -> pd.DataFrame:
     df = pd.read_csv(csv_path)
@@ -141,159 +143,11 @@ def label_by_open_close(df: pd.DataFrame, threshold: float = 0.001) -> pd.DataFr
 
 
 def evaluate_all_strategies(df: pd.DataFrame, short_win=10, long_win=30, rsi_thresh=30) -> pd.DataFrame:
-    import warnings
-    warnings.filterwarnings("ignore", category=RuntimeWarning)  # suppress some warnings for clean output
-
-    def safe_align_compare(s1, s2, op):
-        """
-        Align two series s1 and s2 on index, convert to float, fill NaNs forward,
-        and perform element-wise comparison given by op function (like operator.gt).
-        Returns boolean Series or all False if error.
-        """
-        try:
-            s1a, s2a = s1.align(s2, join='inner')
-            s1a = s1a.astype(float).fillna(method='ffill').fillna(method='bfill')
-            s2a = s2a.astype(float).fillna(method='ffill').fillna(method='bfill')
-            return op(s1a, s2a).reindex(df.index, fill_value=False)
-        except Exception as e:
-            print(f"Warning in safe_align_compare: {e}")
-            return pd.Series(False, index=df.index)
-
-    import operator
-    strategy_df = pd.DataFrame(index=df.index)
-
-    # --- SMA cross ---
-    sma_short_col = f'sma_{short_win}'
-    sma_long_col = f'sma_{long_win}'
-    if sma_short_col in df.columns and sma_long_col in df.columns:
-        prev_short = df[sma_short_col].shift(1)
-        prev_long = df[sma_long_col].shift(1)
-        curr_short = df[sma_short_col]
-        curr_long = df[sma_long_col]
-        buy = safe_align_compare(prev_short, prev_long, operator.lt) & safe_align_compare(curr_short, curr_long, operator.gt)
-        sell = safe_align_compare(prev_short, prev_long, operator.gt) & safe_align_compare(curr_short, curr_long, operator.lt)
-        strategy_df['sma_cross'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['sma_cross'] = 0
-
-    # --- EMA cross ---
-    ema_short_col = f'ema_{short_win}'
-    ema_long_col = f'ema_{long_win}'
-    if ema_short_col in df.columns and ema_long_col in df.columns:
-        prev_short = df[ema_short_col].shift(1)
-        prev_long = df[ema_long_col].shift(1)
-        curr_short = df[ema_short_col]
-        curr_long = df[ema_long_col]
-        buy = safe_align_compare(prev_short, prev_long, operator.lt) & safe_align_compare(curr_short, curr_long, operator.gt)
-        sell = safe_align_compare(prev_short, prev_long, operator.gt) & safe_align_compare(curr_short, curr_long, operator.lt)
-        strategy_df['ema_cross'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['ema_cross'] = 0
-
-    # --- RSI ---
-    if 'rsi' in df.columns:
-        rsi = df['rsi'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        buy = rsi < rsi_thresh
-        sell = rsi > 70
-        strategy_df['rsi_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['rsi_signal'] = 0
-
-    # --- MACD ---
-    if 'macd' in df.columns and 'macd_signal' in df.columns:
-        buy = safe_align_compare(df['macd'], df['macd_signal'], operator.gt)
-        sell = safe_align_compare(df['macd'], df['macd_signal'], operator.lt)
-        strategy_df['macd_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['macd_signal'] = 0
-
-    # --- Bollinger Bands ---
-    if 'bb_lower' in df.columns and 'bb_upper' in df.columns:
-        close = df['close'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        buy = close < df['bb_lower']
-        sell = close > df['bb_upper']
-        strategy_df['bollinger_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['bollinger_signal'] = 0
-
-    # --- Stochastic ---
-    if 'stoch_k' in df.columns and 'stoch_d' in df.columns:
-        stoch_k = df['stoch_k'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        stoch_d = df['stoch_d'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        buy = (stoch_k < 20) & (stoch_k > stoch_d)
-        sell = (stoch_k > 80) & (stoch_k < stoch_d)
-        strategy_df['stoch_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['stoch_signal'] = 0
-
-    # --- Williams %R ---
-    if 'williams_r' in df.columns:
-        willr = df['williams_r'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        buy = willr < -80
-        sell = willr > -20
-        strategy_df['williams_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['williams_signal'] = 0
-
-    # --- CCI ---
-    if 'cci' in df.columns:
-        cci = df['cci'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        buy = cci < -100
-        sell = cci > 100
-        strategy_df['cci_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['cci_signal'] = 0
-
-    # --- ROC ---
-    if 'roc' in df.columns:
-        roc = df['roc'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        buy = roc > 0
-        sell = roc < 0
-        strategy_df['roc_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['roc_signal'] = 0
-
-    # --- ADX ---
-    if 'adx' in df.columns:
-        adx = df['adx'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        trending = adx > 25
-        # ADX doesn't indicate direction, so 2 = trending (buy), 0 neutral
-        strategy_df['adx_trend'] = np.where(trending, 2, 0)
-    else:
-        strategy_df['adx_trend'] = 0
-
-    # --- Vortex ---
-    if 'vortex_pos' in df.columns and 'vortex_neg' in df.columns:
-        vortex_pos = df['vortex_pos'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        vortex_neg = df['vortex_neg'].astype(float).fillna(method='ffill').fillna(method='bfill')
-        buy = vortex_pos > vortex_neg
-        sell = vortex_pos < vortex_neg
-        strategy_df['vortex_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['vortex_signal'] = 0
-
-    # --- OBV ---
-    if 'obv' in df.columns:
-        obv_diff = df['obv'].diff().fillna(0)
-        buy = obv_diff > 0
-        sell = obv_diff < 0
-        strategy_df['obv_signal'] = np.select([buy, sell], [2,1], default=0)
-    else:
-        strategy_df['obv_signal'] = 0
-
-    # --- Final decision by majority vote ---
-    buy_votes = (strategy_df == 2).sum(axis=1)
-    sell_votes = (strategy_df == 1).sum(axis=1)
-
-    strategy_df['final_decision'] = np.select(
-        [buy_votes > sell_votes, sell_votes > buy_votes],
-        [1, 0], default=2
-    )
-
-    # strategy_df['open'] = df['open']
-    # strategy_df['close'] = df['close']
-
-    return strategy_df
+    """
+    Per-indicator strategy signals (2 → buy, 1 → sell, 0 → none) and their majority vote
+    in 'final_decision' (1 → Buy, 0 → Sell, 2 → Neutral). Rules live in strategy_signals.
+    """
+    return evaluate_signals(df, short_win, long_win, rsi_thresh)
 
 
 def calc_strategies_features():
@@ -359,7 +213,7 @@ def calc_strategies_features():
     df = pd.concat([df, strategy_df], axis=1)
 
     # ➕ Save to CSV
-    df.to_csv(config['paths']['processed_data'])
+    save_features(df, config['paths']['processed_data'])
     print(f"Features and strategies saved to: {config['paths']['processed_data']}")
 
     return df
@@ -375,7 +229,8 @@ def main():
 
     evaluation_df['open'] = df['open']
     evaluation_df['close'] = df['close']
-    evaluation_df.to_csv(config['paths']['evaluation'])
+    save_features(evaluation_df, config['paths']['evaluation'])
     print(f"Features and strategies saved to: {config['paths']['evaluation']}")
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import json
+import os
+import re
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# an empty fetch this short and this old is a weekend/holiday; anything else may be a throttled or failed request
+MAX_CLOSED_DAYS = 4
+SETTLE_DAYS = 1
+
+
+def _yahoo_history(ticker: str, start: str, end: str, interval: str) -> pd.DataFrame:
+    import yfinance as yf
+    return yf.Ticker(ticker).history(start=start, end=end, interval=interval)
+
+
+# bars of these intervals are labelled by date; anything else (1m, 5m, 1h, ...) is intraday
+DAILY_INTERVALS = {"1d", "5d", "1wk", "1mo", "3mo"}
+
+
+def _normalize(df: pd.DataFrame, interval: str = "1d") -> pd.DataFrame:
+    df = df.copy()
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    if interval in DAILY_INTERVALS:
+        index = index.normalize()
+    df.index = index.rename("Date")
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class OHLCVCache:
+    """
+    Persistent OHLCV history per (ticker, interval), fetched from Yahoo only for missing date gaps.
+
+    Each series is a Parquet file plus a JSON list of the [start, end) date
+    ranges already fetched, so days without bars (weekends, holidays) are not
+    re-requested. Today is never marked as fetched since its bar is still
+    forming. In offline mode nothing is fetched: queries are served from the
+    cache and, for tickers with one, a local CSV snapshot (``offline_csv``).
+    """
+
+    def __init__(self, root: str = "data/ohlcv_cache", offline: bool = False, offline_csv: dict = None, fetch=_yahoo_history):
+        self.root = root
+        self.offline = offline
+        self.offline_csv = offline_csv or {}
+        self.fetch = fetch
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, ticker: str, interval: str):
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{ticker}_{interval}")
+        return os.path.join(self.root, f"{name}.parquet"), os.path.join(self.root, f"{name}.json")
+
+    def _load(self, ticker: str, interval: str):
+        key = (ticker, interval)
+        if key not in self._frames:
+            data_path, ranges_path = self._paths(ticker, interval)
+            if os.path.exists(data_path) and os.path.exists(ranges_path):
+                df = pd.read_parquet(data_path)
+                with open(ranges_path, "r") as f:
+                    ranges = json.load(f)
+            else:
+                df, ranges = pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name="Date")), []
+            csv_path = self.offline_csv.get(ticker)
+            if self.offline and interval == "1d" and csv_path and os.path.exists(csv_path):
+                snapshot = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+                snapshot = snapshot.rename(columns={c.lower(): c for c in OHLCV_COLUMNS})[OHLCV_COLUMNS]
+                df = _normalize(pd.concat([snapshot, df]) if len(df) else snapshot)
+            self._frames[key] = (df, ranges)
+        return self._frames[key]
+
+    def _save(self, ticker: str, interval: str, df: pd.DataFrame, ranges):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, ranges_path = self._paths(ticker, interval)
+        df.to_parquet(data_path)
+        with open(ranges_path, "w") as f:
+            json.dump(ranges, f)
+
+    def _missing(self, ranges, start: str, end: str):
+        gaps, cursor = [], start
+        for lo, hi in ranges:
+            if hi <= cursor:
+                continue
+            if lo >= end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo))
+            cursor = max(cursor, hi)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    @staticmethod
+    def _closed_days(lo: str, hi: str) -> bool:
+        """Whether an empty fetch of [lo, hi) can be trusted as a weekend or holiday."""
+        lo, hi = pd.Timestamp(lo), pd.Timestamp(hi)
+        return hi - lo <= pd.Timedelta(days=MAX_CLOSED_DAYS) and hi.date() <= date.today() - timedelta(days=SETTLE_DAYS)
+
+    def _fetch_gap(self, ticker: str, lo: str, hi: str, interval: str):
+        df = self.fetch(ticker, lo, hi, interval)
+        if df is None or df.empty:
+            return None
+        df = _normalize(df, interval)
+        if interval not in DAILY_INTERVALS:
+            # keep only the bars of the range that gets marked as fetched
+            df = df.loc[(df.index >= pd.Timestamp(lo)) & (df.index < pd.Timestamp(hi))]
+        return df
+
+    def history(self, ticker: str, start: str, end: str, interval: str = "1d") -> pd.DataFrame:
+        """Bars with start <= date < end (ISO dates), fetching only the gaps not cached yet."""
+        if interval in DAILY_INTERVALS:
+            start, end = pd.Timestamp(start).date().isoformat(), pd.Timestamp(end).date().isoformat()
+        with self._lock:
+            df, ranges = self._load(ticker, interval)
+            gaps = [] if self.offline else self._missing(ranges, start, end)
+            if gaps:
+                fetched, done = [], []
+                for lo, hi in gaps:
+                    bars = self._fetch_gap(ticker, lo, hi, interval)
+                    if bars is not None and not bars.empty:
+                        fetched.append(bars)
+                        done.append((lo, hi))
+                    elif self._closed_days(lo, hi):
+                        done.append((lo, hi))
+                if fetched:
+                    df = _normalize(pd.concat([df] + fetched) if len(df) else pd.concat(fetched), interval)
+                today = date.today().isoformat()
+                # failed gaps stay out of the ranges so the next call retries them
+                done = [[lo, min(hi, today)] for lo, hi in done if lo < min(hi, today)]
+                if fetched or done:
+                    ranges = _merge_ranges(ranges + done)
+                    self._frames[(ticker, interval)] = (df, ranges)
+                    self._save(ticker, interval, df, ranges)
+        return df.loc[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+
+
+def cache_from_env() -> OHLCVCache:
+    """OHLCVCache configured by MARKET_DATA_CACHE / MARKET_DATA_OFFLINE (offline GC=F falls back to the bundled CSV)."""
+    return OHLCVCache(
+        root=os.getenv("MARKET_DATA_CACHE", "data/ohlcv_cache"),
+        offline=os.getenv("MARKET_DATA_OFFLINE", "").lower() in ("1", "true", "yes"),
+        offline_csv={"GC=F": "data/gold_ohlcv_2020_2025.csv"},
+    )
@@ -0,0 +1,185 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.data.numerical_feature_extractor import (
+    load_ohlcv, add_sma, add_ema, add_macd, add_rsi, add_stochastic, add_williams_r,
+    add_cci, add_roc, add_bollinger_bands, add_adx, add_vortex, add_obv
+)
+from src.data.strategy_signals import SignalMatrix, evaluate_signals, FINAL_BUY, FINAL_SELL, FINAL_NEUTRAL
+
+# Swept indicator -> (fn(ohlcv, period, features) adding its columns, columns it adds).
+# Only indicators read by a strategy rule are worth sweeping.
+SWEEP_INDICATORS = {
+    'rsi': (lambda df, p, features: add_rsi(df, p), ['rsi']),
+    'stochastic': (lambda df, p, features: add_stochastic(df, p, features.get('stochastic', {}).get('d', 3)), ['stoch_k', 'stoch_d']),
+    'williams_r': (lambda df, p, features: add_williams_r(df, p), ['williams_r']),
+    'cci': (lambda df, p, features: add_cci(df, p), ['cci']),
+    'roc': (lambda df, p, features: add_roc(df, p), ['roc']),
+    'bollinger_bands': (lambda df, p, features: add_bollinger_bands(df, p), ['bb_upper', 'bb_middle', 'bb_lower']),
+    'adx': (lambda df, p, features: add_adx(df, p), ['adx']),
+    'vortex': (lambda df, p, features: add_vortex(df, p), ['vortex_pos', 'vortex_neg']),
+}
+
+THRESHOLD_KEYS = ['strategy_short_window', 'strategy_long_window', 'strategy_rsi_threshold', 'labeling_threshold']
+
+# Filled in each worker by _init_worker: (name, period) -> indicator frame, plus the fixed columns
+_FEATURE_CACHE = None
+
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _configured_period(features, name):
+    value = features.get(name)
+    if name == 'rsi':
+        return value.get('period', 14) if value else 14
+    if name == 'stochastic':
+        return value['k'] if value else 14
+    return value
+
+
+def build_grid(config):
+    """
+    Splits the ``sweep`` config section into indicator-period groups and threshold combinations.
+
+    Every indicator-period group shares one feature frame (and one SignalMatrix);
+    the threshold combinations are evaluated against it.
+    """
+    sweep = config.get('sweep', {})
+    features = config.get('numerical_features', {})
+    periods = sweep.get('indicator_periods', {})
+
+    indicator_names = [name for name in SWEEP_INDICATORS if name in features or name in periods]
+    period_lists = [_as_list(periods.get(name, _configured_period(features, name))) for name in indicator_names]
+    period_groups = [dict(zip(indicator_names, combo)) for combo in itertools.product(*period_lists)]
+
+    defaults = {
+        'strategy_short_window': config.get('strategy_short_window', 10),
+        'strategy_long_window': config.get('strategy_long_window', 30),
+        'strategy_rsi_threshold': config.get('strategy_rsi_threshold', 30),
+        'labeling_threshold': config.get('labeling', {}).get('threshold', 0.001),
+    }
+    threshold_lists = [_as_list(sweep.get(key, defaults[key])) for key in THRESHOLD_KEYS]
+    threshold_combos = [
+        dict(zip(THRESHOLD_KEYS, combo)) for combo in itertools.product(*threshold_lists)
+        if combo[0] < combo[1]  # short window must be shorter than the long one
+    ]
+    return period_groups, threshold_combos
+
+
+def _compute_indicator(ohlcv, name, period, features):
+    fn, columns = SWEEP_INDICATORS[name]
+    return fn(ohlcv.copy(), period, features)[columns]
+
+
+def build_feature_cache(ohlcv, period_groups, threshold_combos, features):
+    """
+    Computes every distinct indicator column needed by the grid exactly once.
+
+    Rows are trimmed to where all cached columns are valid, so every grid point
+    is scored on the same dates.
+    """
+    windows = sorted({c['strategy_short_window'] for c in threshold_combos} | {c['strategy_long_window'] for c in threshold_combos})
+    base = add_sma(ohlcv.copy(), windows)
+    base = add_ema(base, windows)
+    base = add_macd(base)
+    base = add_obv(base)
+
+    cache = {'base': base}
+    for name in SWEEP_INDICATORS:
+        for period in sorted({group[name] for group in period_groups if name in group}):
+            cache[(name, period)] = _compute_indicator(ohlcv, name, period, features)
+
+    valid = base.notna().all(axis=1)
+    for frame in cache.values():
+        valid &= frame.notna().all(axis=1)
+    return {key: frame.loc[valid] for key, frame in cache.items()}
+
+
+def _init_worker(cache):
+    global _FEATURE_CACHE
+    _FEATURE_CACHE = cache
+
+
+def score_decisions(final_decision, open_, close, label_threshold):
+    """
+    Trades each day's decision over the following day (open -> close).
+
+    Returns the number of trades, the hit rate (decision == next day's
+    open/close label at ``label_threshold``) and the summed P&L in returns.
+    """
+    next_return = np.empty_like(close)
+    next_return[:-1] = (close[1:] - open_[1:]) / open_[1:]
+    next_return[-1] = np.nan
+    next_label = np.where(next_return > label_threshold, FINAL_BUY, np.where(next_return < -label_threshold, FINAL_SELL, FINAL_NEUTRAL))
+
+    position = np.where(final_decision == FINAL_BUY, 1, np.where(final_decision == FINAL_SELL, -1, 0))
+    trades = (position != 0) & ~np.isnan(next_return)
+    n_trades = int(trades.sum())
+    hit_rate = float((final_decision[trades] == next_label[trades]).mean()) if n_trades else np.nan
+    pnl = float(np.nansum(position[trades] * next_return[trades]))
+    return n_trades, hit_rate, pnl
+
+
+def evaluate_period_group(periods, threshold_combos):
+    """Scores every threshold combination for one indicator-period group (runs in a worker)."""
+    cache = _FEATURE_CACHE
+    frames = [cache['base']] + [cache[(name, period)] for name, period in periods.items()]
+    df = pd.concat(frames, axis=1)
+    matrix = SignalMatrix(df)
+    open_ = df['open'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+
+    rows = []
+    for combo in threshold_combos:
+        strategy_df = evaluate_signals(
+            short_win=combo['strategy_short_window'],
+            long_win=combo['strategy_long_window'],
+            rsi_thresh=combo['strategy_rsi_threshold'],
+            matrix=matrix,
+        )
+        n_trades, hit_rate, pnl = score_decisions(
+            strategy_df['final_decision'].to_numpy(), open_, close, combo['labeling_threshold']
+        )
+        rows.append({**{f'{name}_period': p for name, p in periods.items()}, **combo,
+                     'n_trades': n_trades, 'hit_rate': hit_rate, 'pnl': pnl})
+    return rows
+
+
+def run_sweep(config, workers=None):
+    features = config.get('numerical_features', {})
+    sweep = config.get('sweep', {})
+
+    ohlcv = load_ohlcv(config['paths']['raw_data'])
+    ohlcv = ohlcv.loc[config["dates"]['start_date']:config["dates"]['end_date']]
+
+    period_groups, threshold_combos = build_grid(config)
+    print(f"Sweeping {len(period_groups) * len(threshold_combos)} grid points "
+          f"({len(period_groups)} indicator groups x {len(threshold_combos)} threshold sets)")
+    cache = build_feature_cache(ohlcv, period_groups, threshold_combos, features)
+
+    workers = workers or sweep.get('workers') or os.cpu_count()
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache,)) as executor:
+        futures = [executor.submit(evaluate_period_group, periods, threshold_combos) for periods in period_groups]
+        for future in as_completed(futures):
+            rows.extend(future.result())
+
+    results = pd.DataFrame(rows).sort_values('pnl', ascending=False, ignore_index=True)
+    output_path = sweep.get('output', 'data/sweep_results.csv')
+    results.to_csv(output_path, index=False)
+    print(f"Sweep results saved to: {output_path}")
+    return results
+
+
+if __name__ == "__main__":
+    with open("configs/run_pipline.yaml", 'r') as file:
+        config = yaml.safe_load(file)
+
+    print(run_sweep(config).head(10))
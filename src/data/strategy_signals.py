@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+# Per-rule signal codes (as written to the strategy columns)
+HOLD, SELL, BUY = 0, 1, 2
+# final_decision codes
+FINAL_SELL, FINAL_BUY, FINAL_NEUTRAL = 0, 1, 2
+
+# rule name -> (column templates, rule function)
+SIGNAL_RULES = {}
+
+
+
+def signal_rule(name, *columns):
+    """
+    Registers a strategy rule under ``name``.
+
+    ``columns`` are the indicator columns the rule reads; they may use the
+    ``{short_win}``/``{long_win}`` placeholders. The rule is called as
+    ``fn(matrix, *resolved_columns, **params)`` and returns ``(buy, sell)``
+    boolean arrays. Rules whose columns are missing emit HOLD.
+    """
+    def register(fn):
+        SIGNAL_RULES[name] = (columns, fn)
+        return fn
+    return register
+
+
+def _ffill_bfill(values: np.ndarray) -> np.ndarray:
+    """Row-wise ffill followed by bfill of a (columns x rows) float array."""
+    filled = values.copy()
+    missing = np.isnan(values)
+    for i in np.flatnonzero(missing.any(axis=1)):
+        row, row_missing = filled[i], missing[i]
+        first = row_missing.argmin()
+        if row_missing[first]:
+            continue  # nothing to fill from
+        if row_missing[first:].any():
+            last_valid = np.where(row_missing, 0, np.arange(len(row)))
+            np.maximum.accumulate(last_valid, out=last_valid)
+            row[:] = row[last_valid]
+        # the leading gap is back-filled from the first valid value
+        row[:first] = row[first]
+    return filled
+
+
+def _column_values(df: pd.DataFrame, name: str) -> np.ndarray:
+    loc = df.columns.get_loc(name)
+    if isinstance(loc, slice):
+        loc = loc.start
+    elif not isinstance(loc, (int, np.integer)):
+        # duplicated name (e.g. the macd_signal indicator next to the macd_signal strategy): use the first
+        loc = int(np.flatnonzero(loc)[0])
+    return pd.to_numeric(df.iloc[:, loc], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class SignalMatrix:
+    """
+    Every indicator column as one float64 matrix, forward/back-filled once.
+
+    Build it once per feature frame and pass it to ``evaluate_signals`` to
+    re-evaluate the rules under many parameter sets without touching pandas.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns=None):
+        if columns is None:
+            columns = df.columns
+        columns = list(dict.fromkeys(c for c in columns if c in df.columns))
+        self.index = df.index
+        self.positions = {name: i for i, name in enumerate(columns)}
+        # one row per indicator so every column is contiguous
+        self.raw = np.empty((len(columns), len(df)), dtype=np.float64)
+        for i, name in enumerate(columns):
+            self.raw[i] = _column_values(df, name)
+        self.filled = _ffill_bfill(self.raw)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def __len__(self):
+        return self.raw.shape[1]
+
+    def col(self, name):
+        """Forward/back-filled column."""
+        return self.filled[self.positions[name]]
+
+    def raw_col(self, name):
+        """Column exactly as stored in the frame, nans included."""
+        return self.raw[self.positions[name]]
+
+    def prev(self, name):
+        """Filled column shifted by one row; the first row repeats itself (same as filling after shift)."""
+        filled = self.col(name)
+        return np.concatenate((filled[:1], filled[:-1]))
+
+
+def _cross(m, short_col, long_col):
+    prev_short, prev_long = m.prev(short_col), m.prev(long_col)
+    curr_short, curr_long = m.col(short_col), m.col(long_col)
+    buy = (prev_short < prev_long) & (curr_short > curr_long)
+    sell = (prev_short > prev_long) & (curr_short < curr_long)
+    return buy, sell
+
+
+@signal_rule('sma_cross', 'sma_{short_win}', 'sma_{long_win}')
+def sma_cross(m, short_col, long_col, **params):
+    return _cross(m, short_col, long_col)
+
+
+@signal_rule('ema_cross', 'ema_{short_win}', 'ema_{long_win}')
+def ema_cross(m, short_col, long_col, **params):
+    return _cross(m, short_col, long_col)
+
+
+@signal_rule('rsi_signal', 'rsi')
+def rsi_signal(m, rsi_col, rsi_thresh=30, **params):
+    rsi = m.col(rsi_col)
+    return rsi < rsi_thresh, rsi > 70
+
+
+@signal_rule('macd_signal', 'macd', 'macd_signal')
+def macd_signal(m, macd_col, signal_col, **params):
+    macd, signal = m.col(macd_col), m.col(signal_col)
+    return macd > signal, macd < signal
+
+
+@signal_rule('bollinger_signal', 'close', 'bb_lower', 'bb_upper')
+def bollinger_signal(m, close_col, lower_col, upper_col, **params):
+    # only the close is filled; rows without bands never signal
+    close = m.col(close_col)
+    return close < m.raw_col(lower_col), close > m.raw_col(upper_col)
+
+
+@signal_rule('stoch_signal', 'stoch_k', 'stoch_d')
+def stoch_signal(m, k_col, d_col, **params):
+    stoch_k, stoch_d = m.col(k_col), m.col(d_col)
+    return (stoch_k < 20) & (stoch_k > stoch_d), (stoch_k > 80) & (stoch_k < stoch_d)
+
+
+@signal_rule('williams_signal', 'williams_r')
+def williams_signal(m, willr_col, **params):
+    willr = m.col(willr_col)
+    return willr < -80, willr > -20
+
+
+@signal_rule('cci_signal', 'cci')
+def cci_signal(m, cci_col, **params):
+    cci = m.col(cci_col)
+    return cci < -100, cci > 100
+
+
+@signal_rule('roc_signal', 'roc')
+def roc_signal(m, roc_col, **params):
+    roc = m.col(roc_col)
+    return roc > 0, roc < 0
+
+
+@signal_rule('adx_trend', 'adx')
+def adx_trend(m, adx_col, **params):
+    # ADX doesn't indicate direction, so trending counts as buy and never as sell
+    trending = m.col(adx_col) > 25
+    return trending, np.zeros_like(trending)
+
+
+@signal_rule('vortex_signal', 'vortex_pos', 'vortex_neg')
+def vortex_signal(m, pos_col, neg_col, **params):
+    vortex_pos, vortex_neg = m.col(pos_col), m.col(neg_col)
+    return vortex_pos > vortex_neg, vortex_pos < vortex_neg
+
+
+@signal_rule('obv_signal', 'obv')
+def obv_signal(m, obv_col, **params):
+    # nan diffs compare False, i.e. behave like diff().fillna(0)
+    obv_diff = np.diff(m.raw_col(obv_col), prepend=np.nan)
+    return obv_diff > 0, obv_diff < 0
+
+
+def resolve_rule_columns(short_win=10, long_win=30, rules=None):
+    """Indicator columns every rule needs for the given windows."""
+    rules = SIGNAL_RULES if rules is None else rules
+    return {
+        name: [c.format(short_win=short_win, long_win=long_win) for c in columns]
+        for name, (columns, _) in rules.items()
+    }
+
+
+def evaluate_signals(df: pd.DataFrame = None, short_win=10, long_win=30, rsi_thresh=30, matrix: SignalMatrix = None, rules=None) -> pd.DataFrame:
+    """
+    Evaluates every registered rule over one float64 matrix and takes the majority vote.
+
+    Pass a prebuilt ``matrix`` instead of ``df`` when sweeping parameters over
+    the same features.
+    """
+    rules = SIGNAL_RULES if rules is None else rules
+    rule_columns = resolve_rule_columns(short_win, long_win, rules)
+    if matrix is None:
+        needed = [c for columns in rule_columns.values() for c in columns]
+        matrix = SignalMatrix(df, needed)
+    params = {'short_win': short_win, 'long_win': long_win, 'rsi_thresh': rsi_thresh}
+
+    # one row per rule: +1 buy, -1 sell, 0 hold, so the majority vote is a single sum
+    votes = np.zeros((len(rules), len(matrix)), dtype=np.int8)
+    with np.errstate(invalid='ignore'):
+        for j, (name, (_, fn)) in enumerate(rules.items()):
+            columns = rule_columns[name]
+            if not all(c in matrix for c in columns):
+                continue
+            buy, sell = fn(matrix, *columns, **params)
+            # buy wins when both fire, as with np.select([buy, sell], ...)
+            votes[j] = buy
+            votes[j] -= sell & ~buy
+
+    net_votes = votes.sum(axis=0, dtype=np.int16)
+    final = np.where(net_votes > 0, FINAL_BUY, np.where(net_votes < 0, FINAL_SELL, FINAL_NEUTRAL))
+
+    # +1 -> BUY (2), -1 -> SELL (1), 0 -> HOLD (0)
+    signals = np.abs(votes)
+    signals += votes > 0
+    strategy_df = pd.DataFrame(signals.astype(np.int64).T, index=matrix.index, columns=list(rules))
+    strategy_df['final_decision'] = final
+    return strategy_df
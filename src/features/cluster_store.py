@@ -0,0 +1,182 @@
+"""
+Append-only JSONL store for news cluster assignments and the cluster list, so
+clustering a new article costs one appended line instead of a rewrite of
+clustered_news.json / clusters.json.
+
+    python -m src.features.cluster_store --import-json clustered_news.json --seed clusters.json
+    python -m src.features.cluster_store              # just compacts the log
+"""
+import argparse
+import json
+import os
+
+NEWS_PATH = "clustered_news.jsonl"
+CLUSTERS_PATH = "clusters.jsonl"
+
+
+def _iter_lines(path):
+    # skips a torn last line (crash mid-append) and anything else that isn't JSON
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _has_partial_tail(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def iter_assignments(path=NEWS_PATH):
+    """Streams ``{"date", "link", "assigned_clusters"}`` records in the order they were written."""
+    yield from _iter_lines(path)
+
+
+def read_clusters(path=CLUSTERS_PATH):
+    """Cluster names in the order they were added."""
+    return list(dict.fromkeys(_iter_lines(path)))
+
+
+class ClusterStore:
+    """
+    Assignments go to ``path`` and new cluster names to ``clusters_path``, one JSON
+    value per line, buffered ``batch_size`` lines at a time. Reclassifying a link
+    appends a newer record; ``compact`` rewrites the log keeping only the latest
+    record per link, and runs by itself once superseded records make up more than
+    ``compact_ratio - 1`` of the log and on ``close``.
+
+    When ``clusters_path`` doesn't exist yet the cluster list is seeded from
+    ``seed_clusters_path`` (the hand-written clusters.json). Not thread-safe:
+    one writer owns the store.
+    """
+
+    def __init__(self, path=NEWS_PATH, clusters_path=CLUSTERS_PATH, seed_clusters_path=None,
+                 batch_size=16, compact_ratio=2.0):
+        self.path = path
+        self.clusters_path = clusters_path
+        self.batch_size = batch_size
+        self.compact_ratio = compact_ratio
+        for p in (path, clusters_path):
+            directory = os.path.dirname(p)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        seed = []
+        if not os.path.exists(clusters_path) and seed_clusters_path and os.path.exists(seed_clusters_path):
+            with open(seed_clusters_path, "r", encoding="utf-8") as f:
+                seed = json.load(f)
+        self.clusters = read_clusters(clusters_path)
+        self._known = set(self.clusters)
+        self._clusters_file = self._open_append(clusters_path)
+        self.add_clusters(seed)
+
+        self._links = set()
+        self._lines = 0
+        for record in _iter_lines(path):
+            self._links.add(record["link"])
+            self._lines += 1
+        self._pending = []
+        self._file = self._open_append(path)
+
+    @staticmethod
+    def _open_append(path):
+        partial = _has_partial_tail(path)
+        f = open(path, "a", encoding="utf-8")
+        if partial:
+            f.write("\n")  # don't glue the next record onto a torn line
+        return f
+
+    def add_clusters(self, names):
+        """Records the names not seen before and returns them."""
+        added = [name for name in dict.fromkeys(names) if name not in self._known]
+        if added:
+            self.clusters.extend(added)
+            self._known.update(added)
+            self._clusters_file.write("".join(json.dumps(name, ensure_ascii=False) + "\n" for name in added))
+            self._clusters_file.flush()
+        return added
+
+    def append(self, date, link, assigned_clusters):
+        self.add_clusters(assigned_clusters)
+        self._pending.append({"date": str(date), "link": link, "assigned_clusters": assigned_clusters})
+        self._links.add(link)
+        self._lines += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        if self._lines > self.compact_ratio * max(len(self._links), 1):
+            self.compact()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self._pending))
+        self._pending = []
+        self._file.flush()
+
+    def compact(self):
+        """Rewrites the assignment log with only the latest record per link, in log order."""
+        self.flush()
+        if self._lines == len(self._links):
+            return
+        last = {}
+        for i, record in enumerate(_iter_lines(self.path)):
+            last[record["link"]] = i
+        keep = set(last.values())
+        del last
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for i, record in enumerate(_iter_lines(self.path)):
+                if i in keep:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._lines = len(keep)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.compact()
+        self._file.close()
+        self._clusters_file.close()
+
+    def __len__(self):
+        return self._lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def import_json(store, json_path):
+    """Appends the entries of a legacy clustered_news.json list to ``store``; returns how many."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    for entry in entries:
+        store.append(entry["date"], entry["link"], entry.get("assigned_clusters", []))
+    return len(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--news", default=NEWS_PATH)
+    parser.add_argument("--clusters", default=CLUSTERS_PATH)
+    parser.add_argument("--seed", help="initial clusters.json to seed a new cluster log with")
+    parser.add_argument("--import-json", help="legacy clustered_news.json to append to the log")
+    args = parser.parse_args()
+
+    with ClusterStore(args.news, args.clusters, args.seed) as store:
+        if args.import_json:
+            print(f"Imported {import_json(store, args.import_json)} entries from {args.import_json}")
+    print(f"{args.news}: {len(store)} assignments, {len(store.clusters)} clusters")
@@ -1,15 +1,13 @@
-import json
 import pandas as pd
 
-with open("clusters.json", "r", encoding="utf-8") as f:
-    valid_topics = set(json.load(f))  
+from src.features.cluster_store import iter_assignments, read_clusters
 
-with open("clustered_news.json", "r", encoding="utf-8") as f:
-    news = json.load(f)  
+valid_topics = set(read_clusters("clusters.jsonl"))
 
 date_topic_dict = {}
 
-for item in news:
+# one assignment at a time from the log; only the per-date topic sets are kept
+for item in iter_assignments("clustered_news.jsonl"):
     date = item["date"]
     clusters = item.get("assigned_clusters", [])
     matched = [c for c in clusters if c in valid_topics]
@@ -1,6 +1,10 @@
+import asyncio
 import os
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
 import pandas as pd
 import re
 from dotenv import load_dotenv
@@ -9,8 +13,9 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
-from openai import OpenAI
+from openai import AsyncOpenAI
 from tqdm import tqdm
+from src.features.cluster_store import ClusterStore
 
 
 load_dotenv()
@@ -48,50 +53,15 @@ def build_user_prompt(news_text, clusters):
     """
 
 
-def update_clusters(initial_clusters_path, clusters, assigned_clusters):
-    new_clusters_added = False
-    for assigned_cluster in assigned_clusters:
-        if assigned_cluster not in clusters:
-            clusters.append(assigned_cluster)
-            new_clusters_added = True
-    if new_clusters_added:
-        with open(initial_clusters_path, "w", encoding="utf-8") as f:
-            json.dump(clusters, f, indent=2, ensure_ascii=False)
-    return clusters
-
-def append_to_json(json_path, date, link, clusters):
-    new_entry = {
-        "date": str(date),
-        "link": link,
-        "assigned_clusters": clusters
-    }
-
-    if os.path.exists(json_path):
-        with open(json_path, "r", encoding="utf-8") as f:
-            existing_data = json.load(f)
-    else:
-        existing_data = []
-
-    existing_data.append(new_entry)
-
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(existing_data, f, indent=2, ensure_ascii=False)
-
 def clean_json_response(raw_text):
     cleaned = re.sub(r"^```(?:json)?|```$", "", raw_text.strip(), flags=re.IGNORECASE)
     cleaned = cleaned.replace("\\n", "").replace("\\r", "").strip()
     return cleaned
 
 
-if __name__ == "__main__":
-    client = OpenAI(
-        base_url="https://api.avalai.ir/v1",        
-        api_key=API_KEY,
-    )
-
+def make_driver():
     chrome_options = Options()
     # chrome_options.add_argument("--headless")
-    chrome_options = Options()
     chrome_options.add_argument("--ignore-certificate-errors")   # Ignores invalid SSL certs
     chrome_options.add_argument("--log-level=3")                  # Suppress logs (3 = FATAL)
     chrome_options.add_argument("--disable-logging")              # Disable logging entirely
@@ -99,18 +69,177 @@ if __name__ == "__main__":
     chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Hides DevTools warnings
     # chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
-
     service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+def fetch_news_text(driver, link, settle=0.5):
+    driver.get(link)
+    time.sleep(settle)  # Wait for the page to load
+    try:
+        title_elem = driver.find_element(By.XPATH, '//h1[@class="article-title" and @id="articleTitle"]')
+        title = title_elem.text.strip()
+    except:
+        title = "No title found"
+
+    paragraphs = driver.find_elements(By.TAG_NAME, "p")
+    paragraph_texts = [p.text.strip() for p in paragraphs[:5]]
+    return f"{title}\n" + "\n".join(paragraph_texts)
+
+
+class ClusterSet:
+    """The cluster list shared by the classification workers; ``snapshot`` is what goes into a prompt."""
+
+    def __init__(self, clusters):
+        self._clusters = list(clusters)
+        self._known = set(self._clusters)
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._clusters)
+
+    def add(self, assigned_clusters):
+        with self._lock:
+            added = [c for c in dict.fromkeys(assigned_clusters) if c not in self._known]
+            self._clusters.extend(added)
+            self._known.update(added)
+            return added
+
+
+class DriverPool:
+    """One Selenium driver per fetcher thread (a WebDriver must not be shared between threads)."""
+
+    def __init__(self, make=make_driver):
+        self.make = make
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def get(self):
+        if not hasattr(self._local, "driver"):
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+            driver = self.make()
+            with self._lock:
+                # quit() may have run while Chrome was starting
+                if not self._closed:
+                    self._drivers.append(driver)
+                    self._local.driver = driver
+            if not hasattr(self._local, "driver"):
+                driver.quit()
+                raise RuntimeError("DriverPool is closed")
+        return self._local.driver
+
+    def quit(self):
+        with self._lock:
+            self._closed = True
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+async def classify_news(client, news_text, clusters, model="gpt-4o-mini-2024-07-18"):
+    completion = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": build_user_prompt(news_text, clusters)}
+        ],
+        temperature=1,
+        max_tokens=100,
+        top_p=1,
+        stream=False
+    )
+    response_content = completion.choices[0].message.content
+    return json.loads(clean_json_response(response_content))["assigned_clusters"]
+
+
+def _writer(results, store):
+    # the only thread touching the store
+    while True:
+        item = results.get()
+        if item is None:
+            return
+        date, link, assigned_clusters = item
+        try:
+            store.append(date, link, assigned_clusters)
+        except Exception as e:
+            print(f"Error saving {link}: {e}")
+
+
+async def cluster_articles(articles, client, store, fetch_workers=4, llm_concurrency=16, settle=0.5, drivers=None, progress=None):
+    """
+    Clusters ``(date, link)`` articles with a staged pipeline: ``fetch_workers`` Selenium
+    fetcher threads, at most ``llm_concurrency`` classification requests in flight on the
+    async ``client``, and a single writer thread appending to the ``ClusterStore``. Articles are pulled
+    from ``articles`` through a bounded queue. Every request sees the cluster list as it
+    is when the request starts, so articles in flight together can't reuse each other's
+    new clusters. Returns the final cluster list.
+    """
+    cluster_set = ClusterSet(store.clusters)
+    drivers = drivers or DriverPool()
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers)
+    llm_slots = asyncio.Semaphore(llm_concurrency)
+    loop = asyncio.get_running_loop()
+    workers_count = fetch_workers + llm_concurrency
+    queue = asyncio.Queue(maxsize=2 * workers_count)
+    results = Queue(maxsize=4 * workers_count)
+    writer = threading.Thread(target=_writer, args=(results, store), daemon=True)
+    writer.start()
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            date, link = item
+            try:
+                news_text = await loop.run_in_executor(fetch_pool, lambda: fetch_news_text(drivers.get(), link, settle))
+                async with llm_slots:
+                    assigned_clusters = await classify_news(client, news_text, cluster_set.snapshot())
+                cluster_set.add(assigned_clusters)
+                # blocking put keeps the writer's backlog bounded
+                await loop.run_in_executor(None, results.put, (date, link, assigned_clusters))
+            except Exception as e:
+                print(f"Error processing {link}: {e}")
+            if progress is not None:
+                progress.update()
+
+    workers = [asyncio.create_task(worker()) for _ in range(workers_count)]
+    try:
+        for item in articles:
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        await loop.run_in_executor(None, results.put, None)
+        await loop.run_in_executor(None, writer.join)
+        # running fetches must finish before their drivers are quit
+        await loop.run_in_executor(None, lambda: fetch_pool.shutdown(wait=True, cancel_futures=True))
+        drivers.quit()
+    return cluster_set.snapshot()
+
+
+if __name__ == "__main__":
+    client = AsyncOpenAI(
+        base_url="https://api.avalai.ir/v1",        
+        api_key=API_KEY,
+    )
+
     csv_path = "2023.csv"
     start_date = "2025-06-10"
     end_date = "2025-06-30"
     sample_per_day = 5
     initial_clusters_path = "clusters.json"
-    clustered_news_path = "clustered_news.json"
-    with open(initial_clusters_path, "r") as f:
-        clusters = json.load(f)
+    store = ClusterStore("clustered_news.jsonl", "clusters.jsonl", seed_clusters_path=initial_clusters_path)
 
     df = pd.read_csv(csv_path, parse_dates=["date"])
     df["date"] = pd.to_datetime(df["date"])
@@ -119,50 +248,14 @@ if __name__ == "__main__":
     end = pd.to_datetime(end_date)
     date_range = pd.date_range(start=start, end=end)
 
-    for single_date in tqdm(date_range, desc="Processing dates"):
+    articles = []
+    for single_date in date_range:
         day_rows = df[df["date"] == single_date].head(20) 
-        if day_rows.empty:
-            continue
-
         for idx, row in day_rows.iterrows():
             link = row.get("link")
             if not link:
                 continue
+            articles.append((single_date.date(), link))
 
-            try:
-                driver.get(link)
-                time.sleep(0.5)  # Wait for the page to load
-                try:
-                    title_elem = driver.find_element(By.XPATH, '//h1[@class="article-title" and @id="articleTitle"]')
-                    title = title_elem.text.strip()
-                except:
-                    title = "No title found"
-
-                paragraphs = driver.find_elements(By.TAG_NAME, "p")
-                paragraph_texts = [p.text.strip() for p in paragraphs[:5]]
-                news_text = f"{title}\n" + "\n".join(paragraph_texts)
-
-                user_prompt = build_user_prompt(news_text, clusters)
-
-                completion = client.chat.completions.create(
-                    model="gpt-4o-mini-2024-07-18",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=1,
-                    max_tokens=100,
-                    top_p=1,
-                    stream=False
-                )
-
-                response_content = completion.choices[0].message.content
-                result = json.loads(clean_json_response(response_content))
-                assigned_clusters = result["assigned_clusters"]
-                clusters = update_clusters(initial_clusters_path, clusters, assigned_clusters)
-                append_to_json(clustered_news_path, single_date.date(), link, assigned_clusters)
-
-            except Exception as e:
-                print(f"Error processing {link}: {e}")
-
-driver.quit()
+    with store, tqdm(total=len(articles), desc="Clustering articles") as progress:
+        asyncio.run(cluster_articles(articles, client, store, progress=progress))
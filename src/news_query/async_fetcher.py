@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+# httpx logs every request at INFO, which floods the extractors' INFO logging on million-URL runs
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class AsyncFetcher:
+    """
+    Bounded asyncio fetch engine for large URL lists.
+
+    Each host gets its own ``httpx.AsyncClient`` of ``per_host`` keep-alive
+    connections: httpcore rescans every connection of a pool on each request,
+    so one big shared pool costs more CPU per URL than the fetch itself. Idle
+    clients beyond ``max_clients`` are closed, least recently used first. Each
+    host gets at most ``per_host`` requests in flight, and request starts to one
+    host are spaced ``politeness_delay`` seconds apart. Work is pulled from the
+    input iterable through a queue of ``2 * concurrency`` slots, so only a
+    bounded number of items is ever in memory, however long the input is.
+    """
+
+    def __init__(self, concurrency=64, per_host=8, politeness_delay=0.0, timeout=10, headers=None, executor=None,
+                 max_clients=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.max_clients = max_clients or concurrency
+        self.politeness_delay = politeness_delay
+        self.timeout = timeout
+        self.headers = DEFAULT_HEADERS if headers is None else headers
+        # where parse() runs; None is the event loop's default thread pool
+        self.executor = executor
+        self.fetched = 0
+        self.failed = 0
+        self._host_slots = {}
+        self._next_start = {}
+        self._clients = OrderedDict()  # host -> client, least recently used first
+        self._in_use = {}
+        self._ssl_context = None  # shared by the per-host clients; loading the CA bundle per client is slow
+
+    def _host_slot(self, host):
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    async def _polite_wait(self, host):
+        if self.politeness_delay <= 0:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self.politeness_delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _acquire_client(self, host):
+        client = self._clients.pop(host, None)
+        if client is None:
+            limits = httpx.Limits(max_connections=self.per_host, max_keepalive_connections=self.per_host)
+            client = httpx.AsyncClient(headers=self.headers, timeout=self.timeout, limits=limits, follow_redirects=True,
+                                       verify=self._ssl_context)
+        self._clients[host] = client
+        self._in_use[host] = self._in_use.get(host, 0) + 1
+        return client
+
+    async def _release_client(self, host):
+        self._in_use[host] -= 1
+        while len(self._clients) > self.max_clients:
+            # pick and detach before awaiting, so a host acquired meanwhile is never closed
+            idle = next((h for h in self._clients if not self._in_use.get(h)), None)
+            if idle is None:
+                return
+            del self._in_use[idle]
+            await self._clients.pop(idle).aclose()
+
+    async def fetch(self, url):
+        """Response text for ``url``, or None when it can't be fetched for any reason."""
+        try:
+            host = urlsplit(url).hostname or ""
+        except ValueError as e:
+            logger.debug(f"Invalid URL {url}: {e}")
+            self.failed += 1
+            return None
+        async with self._host_slot(host):
+            await self._polite_wait(host)
+            client = self._acquire_client(host)
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                self.fetched += 1
+                return response.text
+            except (httpx.HTTPError, UnicodeDecodeError) as e:
+                logger.debug(f"Error fetching {url}: {e}")
+                self.failed += 1
+                return None
+            except Exception as e:
+                # InvalidURL, bad IDNA hosts, invalid ports...: one bad URL must not kill a worker
+                logger.debug(f"Invalid URL {url}: {e}")
+                self.failed += 1
+                return None
+            finally:
+                await self._release_client(host)
+
+    async def run(self, items, on_result, parse=None):
+        """
+        Fetches every ``(key, url)`` in ``items`` and calls ``on_result(key, url, value)``
+        as each one finishes, where value is ``parse(url, text)`` (or the raw text
+        without ``parse``) and None when the fetch failed.
+        """
+        if self._ssl_context is None:
+            self._ssl_context = httpx.create_ssl_context()
+        queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                key, url = item
+                text = await self.fetch(url)
+                value = text
+                if text is not None and parse is not None:
+                    try:
+                        value = await loop.run_in_executor(self.executor, parse, url, text)
+                    except Exception as e:
+                        logger.debug(f"Error parsing {url}: {e}")
+                        value = None
+                try:
+                    on_result(key, url, value)
+                except Exception as e:
+                    # a failing callback must not take the worker down (the producer would block forever)
+                    logger.error(f"Error handling {url}: {e}")
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            for item in items:
+                await queue.put(item)  # blocks while the queue is full
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            clients, self._clients = list(self._clients.values()), OrderedDict()
+            self._in_use.clear()
+            for client in clients:
+                await client.aclose()
+
+
+def fetch_urls(items, on_result, parse=None, **kwargs) -> AsyncFetcher:
+    """Blocking wrapper around ``AsyncFetcher(**kwargs).run``; returns the fetcher for its counters."""
+    fetcher = AsyncFetcher(**kwargs)
+    asyncio.run(fetcher.run(items, on_result, parse))
+    return fetcher
@@ -0,0 +1,112 @@
+"""
+Benchmarks the async fetch engine against the previous 10-thread requests.get
+loop, using a local HTTP stand-in server with artificial latency. The server
+runs in its own process so it doesn't compete with the client for the GIL.
+
+    python -m src.news_query.benchmark_fetcher --urls 5000 --latency 0.05 --hosts 4
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.news_query.async_fetcher import fetch_urls
+from src.news_query.full_news_extractor import _match_page, get_news_content, match_keywords
+from src.news_query.key_word_filtering import ALL_KEYWORDS
+
+ARTICLE = (
+    "<html><body><h1>Markets</h1>"
+    + "".join(f"<p>Paragraph {i}: gold prices and the federal reserve moved markets today.</p>" for i in range(40))
+    + "</body></html>"
+).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(ARTICLE)))
+        self.end_headers()
+        self.wfile.write(ARTICLE)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(latency: float, ports):
+    Handler.latency = latency
+    server = ThreadingHTTPServer(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_server(latency: float):
+    """Stand-in server process and its port."""
+    ports = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(latency, ports), daemon=True)
+    process.start()
+    return process, ports.get()
+
+
+def synthetic_urls(port: int, n: int, hosts: int):
+    # distinct loopback addresses stand in for distinct news domains
+    for i in range(n):
+        yield ("2025-01-01", f"http://127.0.0.{1 + i % hosts}:{port}/article/{i}")
+
+
+def run_threaded(urls, workers=10):
+    matched = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(get_news_content, url) for _, url in urls]
+        for future in as_completed(futures):
+            matched += match_keywords(future.result(), ALL_KEYWORDS) is not None
+    return matched
+
+
+def run_async(urls, concurrency, per_host):
+    matched = [0]
+
+    def on_result(news_date, url, keywords):
+        matched[0] += keywords is not None
+
+    fetch_urls(urls, on_result, parse=lambda url, html: _match_page(url, html, ALL_KEYWORDS),
+               concurrency=concurrency, per_host=per_host)
+    return matched[0]
+
+
+def run_benchmark(n, latency, hosts, concurrency, per_host, skip_threaded=False):
+    server, port = start_server(latency)
+    try:
+        if not skip_threaded:
+            t0 = time.perf_counter()
+            matched = run_threaded(list(synthetic_urls(port, n, hosts)))
+            elapsed = time.perf_counter() - t0
+            print(f"threaded requests.get x10: {n / elapsed:8.1f} urls/s ({matched} matched)")
+
+        t0 = time.perf_counter()
+        matched = run_async(synthetic_urls(port, n, hosts), concurrency, per_host)
+        elapsed = time.perf_counter() - t0
+        print(f"async fetcher ({concurrency} workers, {per_host}/host): {n / elapsed:8.1f} urls/s ({matched} matched)")
+        print(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--urls", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--per-host", type=int, default=16)
+    parser.add_argument("--skip-threaded", action="store_true")
+    args = parser.parse_args()
+    run_benchmark(args.urls, args.latency, args.hosts, args.concurrency, args.per_host, args.skip_threaded)
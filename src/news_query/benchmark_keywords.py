@@ -0,0 +1,95 @@
+"""
+Benchmarks the compiled keyword matcher against per-keyword scans (the previous
+``keyword.lower() in content_lower`` loop, and a regex search per keyword for
+word-boundary matching), checking both find the same keywords.
+
+    python -m src.news_query.benchmark_keywords --articles 2000
+    python -m src.news_query.benchmark_keywords --corpus data/merged_news.arrow
+
+Without --corpus, synthetic articles are generated with log-normally
+distributed lengths around a typical news article (median ~4,500 characters).
+"""
+import argparse
+import random
+import re
+import time
+
+from src.news_query.key_word_filtering import ALL_KEYWORDS
+from src.news_query.keyword_matcher import KeywordMatcher
+
+FILLER = (
+    "the a of to and in that on for with as said was by at from his her they it this "
+    "officials reported week year market people country according statement minister "
+    "company shares analysts expected percent billion million new spokesperson"
+).split()
+
+
+def load_corpus(path: str, column: str = "news_text", limit: int = None):
+    from src.data.news_store import NewsStore
+    texts = [t for t in NewsStore.open(path).table[column].to_pylist() if t]
+    return texts[:limit] if limit else texts
+
+
+def synthetic_corpus(n: int, median_chars: int = 4500, seed: int = 0):
+    rng = random.Random(seed)
+    words = FILLER * 20 + [k.lower() for k in ALL_KEYWORDS[:150]]
+    corpus = []
+    for _ in range(n):
+        target = int(rng.lognormvariate(0, 0.6) * median_chars)
+        parts, size = [], 0
+        while size < target:
+            word = rng.choice(words)
+            parts.append(word.capitalize() if rng.random() < 0.05 else word)
+            size += len(word) + 1
+        corpus.append(" ".join(parts))
+    return corpus
+
+
+def naive_find(content, keywords):
+    found_keywords = []
+    content_lower = content.lower()
+    for keyword in keywords:
+        if keyword.lower() in content_lower:
+            found_keywords.append(keyword)
+    return set(found_keywords)
+
+
+def naive_find_words(content, keywords):
+    """Reference for word-boundary matching: one regex search per keyword."""
+    content_lower = content.lower()
+    return {k for k in keywords if re.search(r"(?<!\w)" + re.escape(k.lower()) + r"(?!\w)", content_lower)}
+
+
+def time_per_article(find, corpus):
+    t0 = time.perf_counter()
+    results = [find(t) for t in corpus]
+    return results, (time.perf_counter() - t0) / len(corpus)
+
+
+def run_benchmark(corpus, keywords=ALL_KEYWORDS):
+    chars = sum(len(t) for t in corpus)
+    print(f"{len(corpus)} articles, {chars / len(corpus):.0f} chars on average, {len(keywords)} keywords")
+    ok = True
+    for word_boundary, reference in ((False, naive_find), (True, naive_find_words)):
+        mode = "word-boundary" if word_boundary else "substring"
+        expected, naive = time_per_article(lambda t: reference(t, keywords), corpus)
+        t0 = time.perf_counter()
+        matcher = KeywordMatcher(keywords, word_boundary=word_boundary)
+        build = time.perf_counter() - t0
+        found, compiled = time_per_article(matcher.find, corpus)
+        mismatches = sum(a != b for a, b in zip(expected, found))
+        ok &= mismatches == 0
+        print(f"{mode:>13}: per-keyword {naive * 1e3:7.3f} ms/article, compiled {compiled * 1e3:7.3f} ms/article "
+              f"({naive / compiled:.1f}x, built in {build * 1e3:.0f} ms), "
+              f"{sum(map(len, found)) / len(corpus):.1f} keywords/article, {mismatches} mismatches")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="news CSV/Parquet/Arrow file with a news_text column")
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--median-chars", type=int, default=4500)
+    args = parser.parse_args()
+    corpus = load_corpus(args.corpus, limit=args.articles) if args.corpus else synthetic_corpus(args.articles, args.median_chars)
+    raise SystemExit(0 if run_benchmark(corpus) else 1)
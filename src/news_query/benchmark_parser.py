@@ -0,0 +1,89 @@
+"""
+Measures article parsing throughput (articles/s, and articles/s per core) for
+each available parser backend, in one thread, in the previous 10-thread pool
+and in the process pool used by filter_and_save_news.
+
+    python -m src.news_query.benchmark_parser --pages 2000 --workers 8
+    python -m src.news_query.benchmark_parser --html-dir saved_pages/
+
+Without --html-dir, synthetic article pages (~25 KB of markup each) are used.
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.news_query.key_word_filtering import ALL_KEYWORDS
+from src.news_query.page_parser import _lxml_available, extract_main_text, match_page, parse_pool
+
+
+def synthetic_page(i: int) -> str:
+    nav = "".join(f'<li><a href="/section/{j}" class="nav-link">Section {j}</a></li>' for j in range(120))
+    script = "<script>" + "var x = {};".join(str(j) for j in range(400)) + "</script>"
+    paragraphs = "".join(
+        f"<p>Paragraph {j} of article {i}: gold prices rose as the <b>federal reserve</b> signalled "
+        f"that interest rates would stay high, while <a href='/markets'>markets</a> weighed inflation data.</p>"
+        for j in range(30)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Article {i}</title>{script}</head><body>"
+        f"<header><ul>{nav}</ul></header><div class='article-body'>{paragraphs}</div>"
+        f"<footer><ul>{nav}</ul></footer></body></html>"
+    )
+
+
+def load_pages(html_dir: str, limit: int = None):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(html_dir, "*.html")))[:limit]:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    return pages
+
+
+def backends():
+    found = []
+    try:
+        import bs4  # noqa: F401
+        found.append("html.parser")
+    except ImportError:
+        pass
+    if _lxml_available():
+        found.append("lxml")
+    return found
+
+
+def run_benchmark(pages, workers: int):
+    size = sum(len(p) for p in pages) / len(pages)
+    print(f"{len(pages)} pages, {size / 1024:.0f} KB on average")
+    for backend in backends():
+        t0 = time.perf_counter()
+        for page in pages:
+            extract_main_text(page, backend)
+        rate = len(pages) / (time.perf_counter() - t0)
+        print(f"{backend:>11}, 1 thread:           {rate:8.1f} articles/s ({rate:.1f}/core)")
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(lambda page: extract_main_text(page, backend), pages))
+        rate = len(pages) / (time.perf_counter() - t0)
+        # the GIL keeps the threads on one core
+        print(f"{backend:>11}, 10 threads:         {rate:8.1f} articles/s ({rate:.1f}/core)")
+
+        with parse_pool(ALL_KEYWORDS, workers, backend) as pool:
+            list(pool.map(match_page, [""] * workers, pages[:workers]))  # start the workers
+            t0 = time.perf_counter()
+            list(pool.map(match_page, [""] * len(pages), pages, chunksize=1))
+            rate = len(pages) / (time.perf_counter() - t0)
+        cores = min(workers, os.cpu_count())
+        print(f"{backend:>11}, {workers:2d} processes:       {rate:8.1f} articles/s ({rate / cores:.1f}/core, incl. keyword matching)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--html-dir", help="directory of saved article .html files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    pages = load_pages(args.html_dir, args.pages) if args.html_dir else [synthetic_page(i) for i in range(args.pages)]
+    run_benchmark(pages, args.workers)
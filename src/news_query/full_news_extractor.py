@@ -1,15 +1,16 @@
-import sqlite3
 import requests
-from bs4 import BeautifulSoup
 from tqdm import tqdm
-import re
 from datetime import datetime, timedelta
 import pandas as pd
-import os
 from src.news_query.key_word_filtering import ALL_KEYWORDS
 import logging
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from src.news_query.async_fetcher import DEFAULT_HEADERS, fetch_urls
+from src.news_query.keyword_matcher import match_keywords
+from src.news_query.page_parser import extract_main_text, match_page, parse_pool
+from src.news_query.sqlite_stream import BatchWriter, iter_rows
+from src.data.news_db import BBC_SITES, NYT_SITES, connect, distinct_dates, migrate, site_domains, site_rows
 
 
 logging.basicConfig(
@@ -23,33 +24,24 @@ logger = logging.getLogger(__name__)
 
 def get_bbc_urls(db_name, table_name):
     logger.info(f"Fetching BBC URLs from {table_name} in {db_name}")
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute(f"""
-        SELECT date, url FROM {table_name}
-        WHERE url LIKE '%bbc.co.uk%' OR url LIKE '%bbc.com%'
-    """)
-    bbc_news = cursor.fetchall()
+    conn = connect(db_name)
+    # domain index lookup instead of a LIKE scan over every url
+    bbc_news = site_rows(conn, table_name, BBC_SITES)
     conn.close()
     logger.info(f"Retrieved {len(bbc_news)} BBC URLs")
     return bbc_news
 
 def get_times_urls(db_name, table_name):
     logger.info(f"Fetching NYT URLs from {table_name} in {db_name}")
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute(f"""
-        SELECT date, url FROM {table_name}
-        WHERE url LIKE '%nytimes.com%'
-    """)
-    times_news = cursor.fetchall()
+    conn = connect(db_name)
+    times_news = site_rows(conn, table_name, NYT_SITES)
     conn.close()
     logger.info(f"Retrieved {len(times_news)} NYT URLs")
     return times_news
 
 def init_filtered_news_database(db_name="gdelt_data.db", table_name="filtered_news"):
     logger.info(f"Initializing filtered news database: {db_name}, table: {table_name}")
-    conn = sqlite3.connect(db_name)
+    conn = connect(db_name)
     cursor = conn.cursor()
     cursor.execute(f'''
         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -60,24 +52,16 @@ def init_filtered_news_database(db_name="gdelt_data.db", table_name="filtered_ne
         )
     ''')
     conn.commit()
+    migrate(conn, table_name)
     logger.info("Filtered news table initialized")
     return conn
 
 def get_news_content(url, timeout=10):
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        paragraphs = soup.find_all('p')
-        main_text = ' '.join([p.get_text() for p in paragraphs])
-        if not main_text:
-            body_divs = soup.find_all('div', class_=re.compile(r'(body|content|article|main)', re.IGNORECASE))
-            main_text = ' '.join([div.get_text() for div in body_divs])
         logger.debug(f"Fetched content from {url}")
-        return main_text.strip() if main_text else None
+        return extract_main_text(response.text)
     except requests.exceptions.RequestException as e:
         # logger.error(f"Error fetching {url}: {e}")
         return None
@@ -86,71 +70,81 @@ def get_news_content(url, timeout=10):
         return None
 
 
-
 def process_article(news_date, news_url, keywords):
-    content = get_news_content(news_url)
-    if not content:
-        return None
-    found_keywords = []
-    content_lower = content.lower()
-    for keyword in keywords:
-        if keyword.lower() in content_lower:
-            found_keywords.append(keyword)
-    if found_keywords:
-        matched_keywords_str = ", ".join(sorted(set(found_keywords)))
+    matched_keywords_str = match_keywords(get_news_content(news_url), keywords)
+    if matched_keywords_str:
         return (news_date, news_url, matched_keywords_str)
     return None
 
-def filter_and_save_news(db_name="gdelt_data.db", save_db_name="filtered_news.db", raw_table="raw_news", filtered_table="filtered_news", keywords=ALL_KEYWORDS, url_filter=None):
+def _match_page(url, html, keywords):
+    return match_keywords(extract_main_text(html), keywords)
+
+def _filter_rows(rows, total, save_database, filtered_table, keywords, concurrency=64, per_host=8, politeness_delay=0.0,
+                 batch_size=500, parse_workers=None, desc="Filtering in parallel"):
+    """
+    Fetches and keyword-filters a stream of ``(date, url)`` rows, saving matches to filtered_table.
+    Returns (processed, filtered, failed) counts.
+    """
+    processed_count = 0
+    filtered_count = 0
+    progress = tqdm(total=total, desc=desc)
+    writer = BatchWriter(save_database, f'''
+        INSERT OR IGNORE INTO {filtered_table} (date, url, matched_keywords)
+        VALUES (?, ?, ?)
+    ''', batch_size=batch_size)
+
+    def on_result(news_date, news_url, matched_keywords_str):
+        nonlocal processed_count, filtered_count
+        processed_count += 1
+        progress.update()
+        if matched_keywords_str:
+            filtered_count += 1
+            writer.add((news_date, news_url, matched_keywords_str))
+
+    # rows are pulled from the cursor in chunks only as the fetcher's bounded queue drains,
+    # and matches are committed every batch_size rows, so a crash keeps everything already written
+    # pages are parsed in a process pool (one worker per core unless parse_workers is given) while the
+    # event loop keeps fetching; parse_workers=0 parses in the loop's thread pool instead
+    pool = parse_pool(keywords, parse_workers) if parse_workers != 0 else None
+    parse = match_page if pool is not None else partial(_match_page, keywords=keywords)
+    try:
+        fetcher = fetch_urls(
+            rows, on_result, parse=parse,
+            concurrency=concurrency, per_host=per_host, politeness_delay=politeness_delay, executor=pool,
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        writer.flush()
+        progress.close()
+    return processed_count, filtered_count, fetcher.failed
+
+def filter_and_save_news(db_name="gdelt_data.db", save_db_name="filtered_news.db", raw_table="raw_news", filtered_table="filtered_news", keywords=ALL_KEYWORDS, url_filter=None,
+                         concurrency=64, per_host=8, politeness_delay=0.0, chunk_size=1000, batch_size=500, parse_workers=None):
     logger.info(f"Starting parallel news filtering: db={db_name}, raw_table={raw_table}, filtered_table={filtered_table}")
-    conn_raw = sqlite3.connect(db_name)
+    conn_raw = connect(db_name)
     cursor_raw = conn_raw.cursor()
 
     save_database = init_filtered_news_database(save_db_name, filtered_table)
-    save_cursor = save_database.cursor()
 
     query = f"SELECT date, url FROM {raw_table}"
     if url_filter:
         query += f" WHERE {url_filter}"
+    total = conn_raw.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0]
     cursor_raw.execute(query)
-    all_raw_news = cursor_raw.fetchall()
-    conn_raw.close()
-
-    logger.info(f"Fetched {len(all_raw_news)} articles for processing")
-
-    filtered_articles = []
-    failed_to_fetch_count = 0
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_article = {
-            executor.submit(process_article, news_date, news_url, keywords): (news_date, news_url)
-            for news_date, news_url in all_raw_news
-        }
-
-        for future in tqdm(as_completed(future_to_article), total=len(future_to_article), desc="Filtering in parallel"):
-            try:
-                result = future.result()
-                if result:
-                    filtered_articles.append(result)
-            except Exception as e:
-                news_date, news_url = future_to_article[future]
-                # logger.error(f"Error processing article {news_url}: {e}")
-                failed_to_fetch_count += 1
-
-    logger.info(f"Saving {len(filtered_articles)} filtered articles to DB")
-    for article in filtered_articles:
-        try:
-            save_cursor.execute(f'''
-                INSERT OR IGNORE INTO {filtered_table} (date, url, matched_keywords)
-                VALUES (?, ?, ?)
-            ''', article)
-        except sqlite3.Error as e:
-            logger.error(f"Error saving article {article[1]}: {e}")
-
-    save_database.commit()
-    save_database.close()
+    logger.info(f"Streaming {total} articles for processing")
+    try:
+        processed_count, filtered_count, failed_to_fetch_count = _filter_rows(
+            iter_rows(cursor_raw, chunk_size), total, save_database, filtered_table, keywords,
+            concurrency=concurrency, per_host=per_host, politeness_delay=politeness_delay,
+            batch_size=batch_size, parse_workers=parse_workers,
+        )
+    finally:
+        conn_raw.close()
+        save_database.close()
 
-    logger.info(f"Filtering complete: Processed={len(all_raw_news)}, Filtered={len(filtered_articles)}, Failed={failed_to_fetch_count}")
+    logger.info(f"Filtering complete: Processed={processed_count}, Filtered={filtered_count}, Failed={failed_to_fetch_count}")
 
 def get_date_range(start_date="2021-01-01", end_date="2025-06-15"):
     logger.info(f"Generating date range from {start_date} to {end_date}")
@@ -166,86 +160,77 @@ def get_date_range(start_date="2021-01-01", end_date="2025-06-15"):
 
 def find_existing_days(db_name, filtered_table="filtered_news", start_date="2021-01-01", end_date="2025-06-05"):
     logger.info(f"Finding missing days in {filtered_table} from {start_date} to {end_date}")
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute(f"""
-        SELECT DISTINCT date FROM {filtered_table}
-    """)
-    existing_dates = set(row[0] for row in cursor.fetchall())
+    conn = connect(db_name)
+    existing_dates = distinct_dates(conn, filtered_table)
     conn.close()
     return existing_dates
 
 def all_dates(db_name, table="raw_news"):
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute(f"""
-        SELECT DISTINCT date FROM {table}
-    """)
-    existing_dates = set(row[0] for row in cursor.fetchall())
+    conn = connect(db_name)
+    existing_dates = distinct_dates(conn, table)
     conn.close()
     return existing_dates
 
 
-def fill_missing_days(existing_dates, all_dates_names, db_name="gdelt_data.db",save_db_name="filtered_news.db", raw_table="raw_news", filtered_table="filtered_news", ):
+def fill_missing_days(existing_dates=None, all_dates_names=None, db_name="gdelt_data.db", save_db_name="filtered_news.db", raw_table="raw_news", filtered_table="filtered_news",
+                      per_day=300, keywords=ALL_KEYWORDS, chunk_size=1000, batch_size=500, **pipeline_kwargs):
+    """
+    Filters up to ``per_day`` non-BBC/NYT articles for every date in raw_table that has no
+    filtered news yet, in one streaming pass over a single fetch/filter pipeline.
+
+    Missing dates are ``all_dates_names - existing_dates`` when both are given, otherwise
+    one set-difference query against the filtered database.
+    """
     logger.info(f"Filling missing days in {filtered_table}")
-    temp_db = "temp.db"
-    temp_table = "temp_raw_news"
-    conn = sqlite3.connect(db_name)
+    save_database = init_filtered_news_database(save_db_name, filtered_table)
+    conn = connect(db_name)
+    migrate(conn, raw_table)
     cursor = conn.cursor()
-    try:
-        os.remove(temp_db)
-    except:
-        logger.info(f"No temp found")
-        
-        
-    for date in tqdm(all_dates_names, desc="Filling missing days"):
-        if date in existing_dates:
-            continue
-
+    # a temp table lives in the connection's temp store, not in a file per date
+    cursor.execute("CREATE TEMP TABLE missing_dates (date TEXT PRIMARY KEY)")
+    if existing_dates is not None and all_dates_names is not None:
+        cursor.executemany("INSERT INTO missing_dates VALUES (?)", ((d,) for d in set(all_dates_names) - set(existing_dates)))
+    else:
+        cursor.execute("ATTACH DATABASE ? AS filtered", (save_db_name,))
         cursor.execute(f"""
-            SELECT date, url FROM {raw_table}
-            WHERE date = ?
-            AND url NOT LIKE '%bbc.co.uk%'
-            AND url NOT LIKE '%bbc.com%'
-            AND url NOT LIKE '%nytimes.com%'
-            LIMIT 300
-        """, (date,))
-        articles = cursor.fetchall()
-
-        if articles:
-            
-          
-            temp_conn = sqlite3.connect(temp_db)
-            temp_cursor = temp_conn.cursor()
-            temp_cursor.execute(f'''
-                CREATE TABLE IF NOT EXISTS {temp_table} (
-                    date TEXT,
-                    url TEXT
-                )
-            ''')
-            temp_cursor.executemany(f'''
-                INSERT INTO {temp_table} (date, url)
-                VALUES (?, ?)
-            ''', articles)
-            temp_conn.commit()
-
-            filter_and_save_news(
-                db_name=temp_db,
-                raw_table=temp_table,
-                save_db_name=save_db_name,
-                filtered_table=filtered_table,
-                keywords=ALL_KEYWORDS
-            )
-            temp_conn.close()
-            os.remove(temp_db)
+            INSERT INTO missing_dates
+            SELECT date FROM {raw_table}
+            EXCEPT
+            SELECT date FROM filtered.{filtered_table}
+        """)
+        conn.commit()
+        cursor.execute("DETACH DATABASE filtered")
+    conn.commit()
+    missing_count = cursor.execute("SELECT COUNT(*) FROM missing_dates").fetchone()[0]
+
+    # first per_day URLs of every missing date, without the BBC and NYT domains that get_bbc_urls/get_times_urls select
+    excluded = site_domains(conn, raw_table, BBC_SITES + NYT_SITES)
+    placeholders = ", ".join("?" for _ in excluded)
+    query = f"""
+        SELECT date, url FROM (
+            SELECT r.date, r.url, ROW_NUMBER() OVER (PARTITION BY r.date) AS n
+            FROM {raw_table} r JOIN missing_dates m ON r.date = m.date
+            WHERE r.domain NOT IN ({placeholders})
+        )
+        WHERE n <= ?
+    """
+    params = (*excluded, per_day)
+    total = cursor.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+    logger.info(f"{missing_count} missing days, {total} articles to filter")
+    cursor.execute(query, params)
+    try:
+        processed_count, filtered_count, failed_to_fetch_count = _filter_rows(
+            iter_rows(cursor, chunk_size), total, save_database, filtered_table, keywords,
+            batch_size=batch_size, desc="Filling missing days", **pipeline_kwargs,
+        )
+    finally:
+        conn.close()
+        save_database.close()
+    logger.info(f"Finished filling missing days: Processed={processed_count}, Filtered={filtered_count}, Failed={failed_to_fetch_count}")
 
-    conn.close()
-    logger.info("Finished filling missing days")
 def verify_coverage(all_dates, db_name="gdelt_data.db", filtered_table="filtered_news", ):
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT DISTINCT date FROM {filtered_table}")
-    covered_dates = set(row[0] for row in cursor.fetchall())
+    conn = connect(db_name)
+    covered_dates = distinct_dates(conn, filtered_table)
     conn.close()
 
     missing_dates = sorted(list(all_dates - covered_dates))
@@ -4,6 +4,10 @@ from bs4 import BeautifulSoup
 from tqdm import tqdm
 import re
 
+from src.news_query.keyword_matcher import keyword_matcher
+from src.news_query.sqlite_stream import BatchWriter, iter_rows
+from src.data.news_db import connect, migrate
+
 POLITICS_KEYWORDS = [
     "government", "election", "policy", "war", "diplomacy", "president", "parliament",
     "legislation", "sanctions", "protest", "conflict", "trade", "international relations",
@@ -91,7 +95,7 @@ ALL_KEYWORDS = list(set(POLITICS_KEYWORDS + GOLD_FORECASTING_KEYWORDS))
 
 
 def init_filtered_news_database(db_name="gdelt_data.db", table_name="filtered_news"):
-    conn = sqlite3.connect(db_name)
+    conn = connect(db_name)
     cursor = conn.cursor()
     cursor.execute(f'''
         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -102,6 +106,7 @@ def init_filtered_news_database(db_name="gdelt_data.db", table_name="filtered_ne
         )
     ''')
     conn.commit()
+    migrate(conn, table_name)
     return conn
 
 def get_news_content(url, timeout=10):
@@ -136,58 +141,56 @@ def get_news_content(url, timeout=10):
         print(f"  Error parsing {url}: {e}")
         return None
 
-def filter_and_save_news(db_name="gdelt_data.db", raw_table="raw_news", filtered_table="filtered_news", keywords=ALL_KEYWORDS):
+def filter_and_save_news(db_name="gdelt_data.db", raw_table="raw_news", filtered_table="filtered_news", keywords=ALL_KEYWORDS,
+                         chunk_size=1000, batch_size=100):
     """
     Reads URLs from raw_table, fetches their content, filters based on keywords,
     and saves matching news to filtered_table.
+
+    Raw rows are streamed from the cursor chunk_size at a time and matches are
+    written with executemany, committing every batch_size rows.
     """
-    conn_raw = sqlite3.connect(db_name)
+    conn_raw = connect(db_name)
     cursor_raw = conn_raw.cursor()
 
     conn_filtered = init_filtered_news_database(db_name, filtered_table)
-    cursor_filtered = conn_filtered.cursor()
+    # Both tables live in db_name; connect() uses WAL, so the read cursor stays open across the batch commits
+    writer = BatchWriter(conn_filtered, f'''
+        INSERT OR IGNORE INTO {filtered_table} (date, url, matched_keywords)
+        VALUES (?, ?, ?)
+    ''', batch_size=batch_size)
 
+    total = cursor_raw.execute(f"SELECT COUNT(*) FROM {raw_table}").fetchone()[0]
     cursor_raw.execute(f"SELECT date, url FROM {raw_table}")
-    all_raw_news = cursor_raw.fetchall()
 
-    print(f"\nStarting to filter {len(all_raw_news)} raw news URLs...")
+    # compiled once: one pass over each article instead of one scan per keyword
+    matcher = keyword_matcher(keywords)
+
+    print(f"\nStarting to filter {total} raw news URLs...")
     processed_count = 0
     filtered_count = 0
     failed_to_fetch_count = 0
 
-    for news_date, news_url in tqdm(all_raw_news, desc="Filtering news articles"):
-        content = get_news_content(news_url)
-        processed_count += 1
-        if content:
-            found_keywords = []
-            content_lower = content.lower()
-            for keyword in keywords:
-                if keyword.lower() in content_lower:
-                    found_keywords.append(keyword)
-
-            if found_keywords:
-                matched_keywords_str = ", ".join(sorted(list(set(found_keywords)))) # Store unique matched keywords
-                try:
-                    cursor_filtered.execute(f'''
-                        INSERT OR IGNORE INTO {filtered_table} (date, url, matched_keywords)
-                        VALUES (?, ?, ?)
-                    ''', (news_date, news_url, matched_keywords_str))
+    try:
+        for news_date, news_url in tqdm(iter_rows(cursor_raw, chunk_size), total=total, desc="Filtering news articles"):
+            content = get_news_content(news_url)
+            processed_count += 1
+            if content:
+                found_keywords = matcher.find(content)
+
+                if found_keywords:
+                    matched_keywords_str = ", ".join(sorted(found_keywords)) # Store unique matched keywords
+                    writer.add((news_date, news_url, matched_keywords_str))
                     filtered_count += 1
-                except sqlite3.Error as e:
-                    print(f"Error saving filtered news to DB for {news_url}: {e}")
-            
-        else:
-            failed_to_fetch_count += 1
-            # print(f"Could not fetch or parse content for URL: {news_url}")
-
-        # Commit periodically to avoid large transactions and losing data on crash
-        if processed_count % 100 == 0:
-            conn_filtered.commit()
-            # print(f"Processed {processed_count} URLs. Filtered: {filtered_count}")
-
-    conn_filtered.commit()
-    conn_raw.close()
-    conn_filtered.close()
+
+            else:
+                failed_to_fetch_count += 1
+                # print(f"Could not fetch or parse content for URL: {news_url}")
+    finally:
+        # Whatever is still buffered is committed even if the loop is interrupted
+        writer.flush()
+        conn_raw.close()
+        conn_filtered.close()
 
     print(f"\nFiltering complete!")
     print(f"Total URLs processed: {processed_count}")
@@ -0,0 +1,99 @@
+import re
+import threading
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _trie_pattern(node):
+    """Regex for the words in ``node``'s subtree, preferring the longest one (greedy optional tails)."""
+    end = "" in node
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if end:
+        return "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword of a list in a text in one pass.
+
+    The keywords are compiled into a single trie-shaped regex that is tried at
+    each position of the lower-cased text and captures the longest keyword
+    starting there; every shorter keyword starting at the same position is a
+    prefix of it, so those are derived from the distinct captures instead of
+    searched for. Matching is case-insensitive. With ``word_boundary`` a keyword
+    must start and end on a word boundary ("war" no longer matches inside
+    "software", nor "un" inside "under"); without it any substring counts, like
+    the old per-keyword ``in`` loop.
+    """
+
+    def __init__(self, keywords, word_boundary=True):
+        self.word_boundary = word_boundary
+        # lower-cased keyword -> original spellings ("IMF" and "imf" are both reported)
+        self.spellings = {}
+        for keyword in keywords:
+            self.spellings.setdefault(keyword.lower(), set()).add(keyword)
+        trie = {}
+        for word in self.spellings:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        # in word-boundary mode positions inside a word are rejected before the trie is
+        # tried, and the character after the match is captured to check its end boundary
+        pattern = r"(?<!\w)(?=(" + _trie_pattern(trie) + r")(\w?))" if word_boundary else "(?=(" + _trie_pattern(trie) + "))"
+        self.regex = re.compile(pattern) if self.spellings else None
+        # findall() capture -> keywords it contains that start where it starts
+        self._expansions = {}
+
+    def _expand(self, capture):
+        words = self._expansions.get(capture)
+        if words is None:
+            if self.word_boundary:
+                longest, followed_by_word_char = capture[0], bool(capture[1])
+                # a shorter keyword is followed by the next character of the longest one
+                words = [longest[:i] for i in range(1, len(longest)) if longest[:i] in self.spellings and not _WORD_CHAR.match(longest, i)]
+                if not followed_by_word_char:
+                    words.append(longest)
+            else:
+                words = [capture[:i] for i in range(1, len(capture) + 1) if capture[:i] in self.spellings]
+            words = self._expansions[capture] = [spelling for word in words for spelling in self.spellings[word]]
+        return words
+
+    def find(self, text):
+        """Set of keywords (original spelling) occurring in ``text``."""
+        if not text or self.regex is None:
+            return set()
+        found = set()
+        for capture in set(self.regex.findall(text.lower())):
+            found.update(self._expand(capture))
+        return found
+
+
+_MATCHERS = {}
+_MATCHERS_LOCK = threading.Lock()
+
+
+def keyword_matcher(keywords, word_boundary=True) -> KeywordMatcher:
+    """The process-wide KeywordMatcher for this keyword list, compiled on first use."""
+    key = (frozenset(keywords), word_boundary)
+    matcher = _MATCHERS.get(key)
+    if matcher is None:
+        with _MATCHERS_LOCK:
+            matcher = _MATCHERS.get(key)
+            if matcher is None:
+                matcher = _MATCHERS[key] = KeywordMatcher(keywords, word_boundary)
+    return matcher
+
+
+def match_keywords(content, keywords):
+    """Comma-joined sorted keywords found in ``content`` (case-insensitive), or None."""
+    if not content:
+        return None
+    found_keywords = keyword_matcher(keywords).find(content)
+    if found_keywords:
+        return ", ".join(sorted(found_keywords))
+    return None
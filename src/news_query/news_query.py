@@ -1,13 +1,16 @@
-import sqlite3
 from datetime import datetime, timedelta
 import time
 import gdelt
 from dateutil.relativedelta import relativedelta
 from tqdm import tqdm
-import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from src.data.news_coverage import daily_counts
+from src.data.news_db import connect, distinct_dates, ingest, migrate
 
 def init_database(db_name="gdelt_data.db",table_name="raw_news"):
-    conn = sqlite3.connect(db_name)
+    conn = connect(db_name)
     cursor = conn.cursor()
     cursor.execute(f'''
         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -17,77 +20,99 @@ def init_database(db_name="gdelt_data.db",table_name="raw_news"):
         )
     ''')
     conn.commit()
+    migrate(conn, table_name)
     return conn
 
 def save_to_database(conn, date_url_data, table_name="raw_news"):
-    cursor = conn.cursor()
-    for day in date_url_data:
-        date = day['date']
-        urls = day['urls']
-        for url in urls:
-            cursor.execute(f'''
-                INSERT OR IGNORE INTO {table_name} (date, url)
-                VALUES (?, ?)
-            ''', (date, url))
-    conn.commit()
+    records = ((day['date'], url) for day in date_url_data for url in day['urls'])
+    return ingest(conn, table_name, ("date", "url"), records)
+
+_gdelt_clients = threading.local()
 
-def crawl_gdelt(start_date, end_date):
-    gd2 = gdelt.gdelt(version=2)
+def _gdelt_client():
+    # one client per worker thread
+    if not hasattr(_gdelt_clients, "gd2"):
+        _gdelt_clients.gd2 = gdelt.gdelt(version=2)
+    return _gdelt_clients.gd2
+
+def fetch_day_urls(day):
+    """MentionIdentifier URLs mentioned on ``day`` (a datetime), straight from the mentions DataFrame."""
+    results = _gdelt_client().Search([day.strftime('%Y %m %d')], table='mentions')
+    if results is None or len(results) == 0:
+        return []
+    # only the URL column is kept; the rows are stored under the crawled day
+    return results["MentionIdentifier"].tolist()
+
+def _day_range(start_date, end_date):
     start_datetime = datetime.strptime(start_date, '%Y %m %d')
     end_datetime = datetime.strptime(end_date, '%Y %m %d')
     if start_datetime > end_datetime:
         raise Exception("No days between dates")
-    delta = end_datetime - start_datetime
-    num_days = delta.days + 1
-    print(f"Starting download for {num_days} days...\n")
-    date_url_data = []
-    for i in tqdm(range(num_days), desc="Processing dates"):
-        current_date = start_datetime + timedelta(days=i)
-        current_date_str = current_date.strftime('%Y %m %d')
-        formatted_date = current_date.strftime('%d %B %Y')
-        start_time = time.time()
-        try:
-            results_json = gd2.Search([current_date_str], table='mentions', output='json')
-            results_json = json.loads(results_json)
-            urls = []
-            for record in results_json:
-                date = record["EventTimeDate"]
-                dt = datetime.strptime(str(date), "%Y%m%d%H%M%S")
-                formatted_date = dt.strftime("%d %B %Y")
-                url = record["MentionIdentifier"]
-                urls.append(url)
-            date_url_data.append({
-                'date': formatted_date,
-                'urls': urls
-            })
-            elapsed_time = time.time() - start_time
-            print(f"[{formatted_date}] Retrieved {len(urls)} URLs in {elapsed_time:.2f} seconds")
-        except Exception as e:
-            print(f"Error processing {formatted_date}: {e}")
-            continue
+    num_days = (end_datetime - start_datetime).days + 1
+    return [start_datetime + timedelta(days=i) for i in range(num_days)]
+
+def iter_gdelt_days(days, workers=8):
+    """
+    Fetches ``days`` in a pool of ``workers`` threads and yields ``{'date', 'urls'}`` per day as each
+    completes (not in date order). At most 2 * workers days are in flight or waiting, so memory
+    doesn't grow with the length of the range. Days that fail are logged and skipped.
+    """
+    pending = iter(days)
+    in_flight = {}
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            for day in islice(pending, 2 * workers - len(in_flight)):
+                in_flight[executor.submit(fetch_day_urls, day)] = (day, time.time())
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                day, start_time = in_flight.pop(future)
+                formatted_date = day.strftime('%d %B %Y')
+                try:
+                    urls = future.result()
+                except Exception as e:
+                    print(f"Error processing {formatted_date}: {e}")
+                    continue
+                print(f"[{formatted_date}] Retrieved {len(urls)} URLs in {time.time() - start_time:.2f} seconds")
+                yield {'date': formatted_date, 'urls': urls}
+    finally:
+        # a consumer that stops early doesn't wait for the queued days
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def crawl_gdelt(start_date, end_date, workers=8):
+    days = _day_range(start_date, end_date)
+    print(f"Starting download for {len(days)} days...\n")
+    date_url_data = list(tqdm(iter_gdelt_days(days, workers), total=len(days), desc="Processing dates"))
     print("Crawling complete!")
     return date_url_data
 
+def crawl_gdelt_to_database(start_date, end_date, db_name="gdelt_data.db", table_name="raw_news", workers=8):
+    """
+    Crawls start_date..end_date ('%Y %m %d') into table_name, saving each day as soon as it is
+    fetched. Days already in the table are skipped, so an interrupted crawl resumes where it stopped.
+    """
+    conn = init_database(db_name, table_name)
+    present = distinct_dates(conn, table_name)
+    days = [day for day in _day_range(start_date, end_date) if day.strftime('%d %B %Y') not in present]
+    print(f"Starting download for {len(days)} days ({len(present)} already saved)...\n")
+    saved = 0
+    try:
+        for day in tqdm(iter_gdelt_days(days, workers), total=len(days), desc="Processing dates"):
+            if day['urls']:
+                save_to_database(conn, [day], table_name)
+                saved += 1
+    finally:
+        conn.close()
+    print(f"Crawling complete! Saved {saved} of {len(days)} days")
+    return saved
+
 def save_gdelt_data(date_url_data, db_name="gdelt_data.db", table_name = "raw_news"):
     conn = init_database(db_name, table_name)
     save_to_database(conn, date_url_data, table_name)
-    cursor = conn.cursor()
-    cursor.execute(f'''
-        SELECT date, url FROM {table_name}
-        ORDER BY date
-    ''')
-    sorted_data = cursor.fetchall()
     print("\nData in database:")
-    current_date = None
-    url_count = 0
-    for date, url in sorted_data:
-        if date != current_date:
-            if current_date is not None:
-                print(f"{current_date}: {url_count} URLs")
-            current_date = date
-            url_count = 1
-        else:
-            url_count += 1
-    if current_date is not None:
-        print(f"{current_date}: {url_count} URLs")
+    # one GROUP BY over the date index instead of fetching every row
+    for date, url_count in daily_counts(conn, table_name):
+        print(f"{date}: {url_count} URLs")
     conn.close()
@@ -0,0 +1,90 @@
+"""
+Article text extraction and keyword matching for fetched pages, runnable in a
+process pool so parsing isn't serialized with the fetch loop by the GIL.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from src.news_query.keyword_matcher import match_keywords
+
+BODY_CLASS = re.compile(r'(body|content|article|main)', re.IGNORECASE)
+
+
+def _lxml_available():
+    try:
+        import lxml.html  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# lxml parses in C; BeautifulSoup's html.parser is the pure-Python fallback
+PARSER_BACKEND = "lxml" if _lxml_available() else "html.parser"
+
+
+def _extract_lxml(html):
+    import lxml.etree
+    import lxml.html
+    if isinstance(html, str):
+        # str input with an XML encoding declaration is rejected by lxml, bytes are not
+        html = html.encode("utf-8", "replace")
+    if not html.strip():
+        return None
+    try:
+        doc = lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except (lxml.etree.ParserError, ValueError):
+        return None
+    main_text = ' '.join([p.text_content() for p in doc.iter('p')])
+    if not main_text:
+        body_divs = [div for div in doc.iter('div') if _has_body_class(div.get('class'))]
+        main_text = ' '.join([div.text_content() for div in body_divs])
+    return main_text.strip() if main_text else None
+
+
+def _has_body_class(classes):
+    # same rule as BeautifulSoup's class_=regex: any single class, or the whole attribute
+    if not classes:
+        return False
+    return any(BODY_CLASS.search(c) for c in classes.split()) or BODY_CLASS.search(classes) is not None
+
+
+def _extract_soup(html, features='html.parser'):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, features)
+    paragraphs = soup.find_all('p')
+    main_text = ' '.join([p.get_text() for p in paragraphs])
+    if not main_text:
+        body_divs = soup.find_all('div', class_=BODY_CLASS)
+        main_text = ' '.join([div.get_text() for div in body_divs])
+    return main_text.strip() if main_text else None
+
+
+def extract_main_text(html, backend=None):
+    """Text of the page's <p> elements (or of body/content/article/main divs when there are none), or None."""
+    if (backend or PARSER_BACKEND) == "lxml":
+        return _extract_lxml(html)
+    return _extract_soup(html)
+
+
+# Per-process state set by the pool initializer, so keywords aren't pickled with every page
+_worker = {}
+
+
+def _init_worker(keywords, backend):
+    _worker["keywords"] = keywords
+    _worker["backend"] = backend
+
+
+def match_page(url, html):
+    """Matched keywords string for a fetched page, in a worker of ``parse_pool``."""
+    return match_keywords(extract_main_text(html, _worker["backend"]), _worker["keywords"])
+
+
+def parse_pool(keywords, workers=None, backend=None) -> ProcessPoolExecutor:
+    """Process pool whose workers run ``match_page`` for ``keywords``; one worker per core by default."""
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(list(keywords), backend or PARSER_BACKEND),
+    )
@@ -0,0 +1,56 @@
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+def iter_rows(cursor, chunk_size=1000):
+    """Rows of an executed cursor, fetched ``chunk_size`` at a time instead of all at once."""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+class BatchWriter:
+    """
+    Buffers rows for ``sql`` and writes them with executemany, one transaction per batch.
+
+    Everything written before a crash stays committed; on failure the batch is
+    retried row by row so one bad row doesn't drop the rest.
+    """
+
+    def __init__(self, conn, sql, batch_size=500):
+        self.conn = conn
+        self.sql = sql
+        self.batch_size = batch_size
+        self.pending = []
+
+    def add(self, row):
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        try:
+            with self.conn:
+                self.conn.executemany(self.sql, rows)
+        except sqlite3.Error as e:
+            logger.error(f"Batch insert failed ({e}), retrying {len(rows)} rows one by one")
+            for row in rows:
+                try:
+                    with self.conn:
+                        self.conn.execute(self.sql, row)
+                except sqlite3.Error as e:
+                    logger.error(f"Error saving row {row[:2]}: {e}")
+                    continue
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import time
+
+FSYNC_POLICIES = ("batch", "close", "never")
+
+# Config keys that change how a run is scheduled but not what the agent answers
+_SCHEDULING_KEYS = {
+    "dates": None,
+    "hyps": {"concurrency", "rate_limit_retries", "rate_limit_base_delay", "checkpoint_batch"},
+    "paths": {"results"},
+    "sweep": None,
+    "llm_cache": None,
+}
+
+
+def config_hash(config: dict) -> str:
+    """Short hash of everything in ``config`` that can change an agent response."""
+    relevant = {}
+    for key, value in config.items():
+        if key in _SCHEDULING_KEYS:
+            skip = _SCHEDULING_KEYS[key]
+            if skip is None:
+                continue
+            value = {k: v for k, v in value.items() if k not in skip}
+        relevant[key] = value
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultsStore:
+    """
+    Append-only JSONL store of backtest responses.
+
+    Each record is keyed by (date, lookback, inference_type, config_hash).
+    Records are buffered and appended ``batch_size`` at a time. ``fsync``
+    controls durability: "batch" syncs after every appended batch, "close"
+    only when the store is closed and "never" leaves it to the OS. A
+    partially written last line (crash mid-append) is ignored on load.
+    """
+
+    def __init__(self, path: str, batch_size: int = 16, fsync: str = "batch"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync policy '{fsync}' is not valid. Valid options are: {', '.join(FSYNC_POLICIES)}")
+        self.path = path
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.records = {}
+        self._pending = []
+        self._load()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if self._partial_tail:
+            self._file.write("\n")  # don't glue the next record onto a torn line
+
+    @staticmethod
+    def key(date: str, lookback: int, inference_type: str, cfg_hash: str) -> tuple:
+        return (date, int(lookback), inference_type, cfg_hash)
+
+    def _load(self):
+        self._partial_tail = False
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                self._partial_tail = not line.endswith("\n")
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.records[self._record_key(record)] = record
+
+    def _record_key(self, record: dict) -> tuple:
+        return self.key(record["date"], record["lookback"], record["inference_type"], record["config_hash"])
+
+    def __contains__(self, key):
+        return key in self.records
+
+    def get(self, key):
+        record = self.records.get(key)
+        return None if record is None else record["response"]
+
+    def add(self, date: str, lookback: int, inference_type: str, cfg_hash: str, response, **extra):
+        record = {
+            "date": date, "lookback": int(lookback), "inference_type": inference_type,
+            "config_hash": cfg_hash, "response": response, "created_at": time.time(), **extra,
+        }
+        self.records[self._record_key(record)] = record
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._file.write("".join(json.dumps(r, default=str) + "\n" for r in self._pending))
+        self._pending = []
+        self._file.flush()
+        if self.fsync == "batch":
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        if self.fsync == "close":
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
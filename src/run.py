@@ -1,12 +1,15 @@
 from datetime import datetime, timedelta
-import re 
+import re
 import yaml
-from src.agent.agent import GoldTradingAgent
-import pickle
-import os
-    
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.results_store import ResultsStore, config_hash
+
+
 
-    
 def get_action_from_prompt(prompt):
     match = re.search(r'"action"/s*:/s*(/d+)', prompt)
     if match:
@@ -15,47 +18,147 @@ def get_action_from_prompt(prompt):
         print("Action not found.")
         return -1
 
-def choose_actions(agent, config):
+
+def _is_rate_limited(exc: Exception) -> bool:
+    # openai.RateLimitError and httpx-style errors carry status_code 429
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429 or "RateLimit" in type(exc).__name__
+
+
+def _retry_after(exc: Exception):
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitBackoff:
     """
-    Runs agent for each day using a rolling lookback window,
-    gets decisions, and evaluates them based on next day's price movement.
+    Exponential backoff shared by every worker of a backtest.
+
+    A rate-limited call pauses all workers (not just the one that hit the limit)
+    until the backoff expires, so the pool doesn't keep hammering the API.
     """
+
+    def __init__(self, retries=5, base_delay=2.0, max_delay=60.0):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def call(self, fn, *args, **kwargs):
+        for attempt in range(self.retries + 1):
+            self._wait()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as exc:
+                if attempt == self.retries or not _is_rate_limited(exc):
+                    raise
+                delay = _retry_after(exc) or min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay *= 1 + 0.25 * random.random()  # jitter so workers don't resume in lockstep
+                with self._lock:
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                print(f"Rate limited, backing off {delay:.1f}s (attempt {attempt + 1}/{self.retries})")
+
+
+def backtest_windows(config):
+    """(lookback start, day) date strings for every simulated day, in order."""
     start_date = config["dates"]['start_date']
     end_date = config["dates"]['end_date']
-    news_csv_path = config['paths']['news']
-    numerical_csv_path = config['paths']['evaluation']
     lookback = config["hyps"]["lookback"]
 
-    dates = []
-    model_responses = []
-
     current_date = datetime.strptime(start_date, "%Y-%m-%d %H:%M:%S") + timedelta(days=lookback)
     end_date_dt = datetime.strptime(end_date, "%Y-%m-%d %H:%M:%S")
-    os.makedirs("trader_results", exist_ok=True)
-
+    windows = []
     while current_date <= end_date_dt:
         lookback_start = current_date - timedelta(days=lookback)
-        lb_start_str = lookback_start.strftime("%Y-%m-%d")
-        current_str = current_date.strftime("%Y-%m-%d")
-        model_response = agent.run(lb_start_str, current_str, news_csv_path, numerical_csv_path, "SIMPLE")
-        dates.append(current_str)
-        model_responses.append(model_response)
-        print(f"### Current data: {current_str} ###")
-
-        # with open('trader_results/model_responses_numeric.pkl', 'wb') as f:
-        #     pickle.dump(model_responses, f)
-        # with open('trader_results/dates_numeric.pkl', 'wb') as f:
-        #     pickle.dump(dates, f)
-
+        windows.append((lookback_start.strftime("%Y-%m-%d"), current_date.strftime("%Y-%m-%d")))
         current_date += timedelta(days=1)
+    return windows
+
+
+def choose_actions(agent, config, concurrency=None, inference_type="SIMPLE", store=None):
+    """
+    Runs agent for each day using a rolling lookback window,
+    gets decisions, and evaluates them based on next day's price movement.
+
+    Days are independent, so up to ``concurrency`` of them (default
+    ``hyps.concurrency``, else 1) run at once; rate-limit errors are retried
+    with a shared backoff. Results come back in date order.
+
+    Responses are checkpointed to ``store`` (default: a ResultsStore at
+    ``paths.results`` when configured). Days already in the store for this
+    lookback, inference type and config are not re-run.
+    """
+    news_csv_path = config['paths']['news']
+    numerical_csv_path = config['paths']['evaluation']
+    hyps = config["hyps"]
+    lookback = hyps["lookback"]
+    concurrency = concurrency or hyps.get("concurrency", 1)
+    backoff = RateLimitBackoff(
+        retries=hyps.get("rate_limit_retries", 5),
+        base_delay=hyps.get("rate_limit_base_delay", 2.0),
+    )
+
+    owns_store = store is None and config['paths'].get('results') is not None
+    if owns_store:
+        store = ResultsStore(config['paths']['results'], batch_size=hyps.get("checkpoint_batch", 16))
+    cfg_hash = config_hash(config)
+
+    windows = backtest_windows(config)
+    dates = [current_str for _, current_str in windows]
+    model_responses = [None] * len(windows)
+    todo = []
+    for i, (lb_start_str, current_str) in enumerate(windows):
+        key = ResultsStore.key(current_str, lookback, inference_type, cfg_hash)
+        if store is not None and key in store:
+            model_responses[i] = store.get(key)
+        else:
+            todo.append(i)
+    if len(todo) < len(windows):
+        print(f"Resuming: {len(windows) - len(todo)} of {len(windows)} days already in the results store")
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(backoff.call, agent.run, *windows[i], news_csv_path, numerical_csv_path, inference_type): i
+                for i in todo
+            }
+            try:
+                for future in as_completed(futures):
+                    i = futures[future]
+                    model_responses[i] = future.result()
+                    if store is not None:
+                        store.add(dates[i], lookback, inference_type, cfg_hash, model_responses[i],
+                                  lookback_start=windows[i][0])
+                    print(f"### Current data: {dates[i]} ###")
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        if owns_store:
+            store.close()
+        elif store is not None:
+            store.flush()
+
+    return dates, model_responses
+
 
 
-  
 if __name__ == "__main__":
+    from src.agent.agent import GoldTradingAgent
+    from src.agent.llm_cache import LLMCache
 
-    agent = GoldTradingAgent()
-    
     with open("configs/run_pipline.yaml", 'r') as file:
         config = yaml.safe_load(file)
-    
-    choose_actions(agent, config)
\ No newline at end of file
+
+    agent = GoldTradingAgent(llm_cache=LLMCache.from_config(config), news_digests=config["paths"].get("news_digests"))
+
+    choose_actions(agent, config)
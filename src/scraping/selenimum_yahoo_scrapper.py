@@ -5,9 +5,9 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-import sqlite3
 import logging
-from utils import parse_relative_time
+from src.scraping.utils import parse_relative_time
+from src.data.news_db import connect, ingest, migrate
 
 logging.basicConfig(
     level=logging.INFO,
@@ -97,7 +97,7 @@ def crawl_gold_news(ticker='GC=F', months=24):
 def save_to_sqlite(data, db_name, table_name):
     logging.info(f"Saving data to SQLite DB: {db_name}, Table: {table_name}")
     try:
-        conn = sqlite3.connect(db_name)
+        conn = connect(db_name)
         cursor = conn.cursor()
         cursor.execute(f'''
             CREATE TABLE IF NOT EXISTS {table_name} (
@@ -108,18 +108,11 @@ def save_to_sqlite(data, db_name, table_name):
                 absolute_time TEXT
             )
         ''')
-        for idx, article in enumerate(data):
-            cursor.execute(f'''
-                INSERT INTO {table_name} (title, url, relative_time, absolute_time)
-                VALUES (?, ?, ?, ?)
-            ''', (
-                article['title'], article['url'],
-                article['relative_time'], article['absolute_time']
-            ))
-            logging.info(f"Inserted article {idx+1}: {article['title']}")
-        conn.commit()
+        migrate(conn, table_name)
+        columns = ("title", "url", "relative_time", "absolute_time")
+        stats = ingest(conn, table_name, columns, (tuple(article[c] for c in columns) for article in data), key=("url",))
         conn.close()
-        logging.info(f"Saved {len(data)} articles to SQLite DB: {db_name}")
+        logging.info(f"Saved {stats.inserted} new of {len(data)} articles to SQLite DB: {db_name}")
     except Exception as e:
         logging.error(f"Failed to save to SQLite: {e}")
 
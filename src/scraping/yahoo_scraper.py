@@ -4,8 +4,8 @@ import time
 import pandas as pd
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from utils import parse_relative_time
-import sqlite3
+from src.scraping.utils import parse_relative_time
+from src.data.news_db import connect, ingest, migrate
 import logging
 
 logger = logging.getLogger()
@@ -131,7 +131,7 @@ def crawl_gold_news(url, months=12):
 
 
 def save_to_sqlite(data, db_name, table_name):
-    conn = sqlite3.connect(db_name)
+    conn = connect(db_name)
     cursor = conn.cursor()
     
     cursor.execute(f'''
@@ -144,22 +144,12 @@ def save_to_sqlite(data, db_name, table_name):
             tickers TEXT
         )
     ''')
+    migrate(conn, table_name)
     
-    for article in data:
-        cursor.execute(f'''
-            INSERT INTO {table_name} (title, url, publication_time, absolute_time, tickers)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            article['title'],
-            article['url'],
-            article['publication_time'],
-            article['absolute_time'],
-            article['tickers']
-        ))
-
-    conn.commit()
+    columns = ("title", "url", "publication_time", "absolute_time", "tickers")
+    stats = ingest(conn, table_name, columns, (tuple(article[c] for c in columns) for article in data), key=("url",))
     conn.close()
-    logging.info(f"Saved {len(data)} articles to {table_name} table in {db_name}")
+    logging.info(f"Saved {stats.inserted} new of {len(data)} articles to {table_name} table in {db_name}")
 
 def save_to_csv(data, filename):
     df = pd.DataFrame(data)